@@ -5,6 +5,7 @@ from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
 from app.database import DB_URL, Base
+from app.maintenance import is_partition_name
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -26,6 +27,11 @@ from app.models import *
 target_metadata = Base.metadata
 
 
+def include_name(name, type_, parent_names):
+	# Monthly partitions are managed by app.maintenance, not by the models.
+	return not (type_ == "table" and is_partition_name(name))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +54,7 @@ def run_migrations_offline() -> None:
 	context.configure(
 		url=url,
 		target_metadata=target_metadata,
+		include_name=include_name,
 		literal_binds=True,
 		dialect_opts={"paramstyle": "named"},
 	)
@@ -71,7 +78,9 @@ def run_migrations_online() -> None:
 
 	with connectable.connect() as connection:
 		context.configure(
-			connection=connection, target_metadata=target_metadata
+			connection=connection,
+			target_metadata=target_metadata,
+			include_name=include_name,
 		)
 
 		with context.begin_transaction():
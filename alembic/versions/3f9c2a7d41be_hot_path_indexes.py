@@ -0,0 +1,137 @@
+"""hot path indexes
+
+Revision ID: 3f9c2a7d41be
+Revises: d45e301e2fc0
+Create Date: 2026-10-18 09:12:04.518230
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d41be'
+down_revision: str | Sequence[str] | None = 'd45e301e2fc0'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEXES = (
+    'ix_tasks_key',
+    'ix_tasks_project_id_id',
+    'ix_tasks_project_id_status_id',
+    'ix_tasks_assignee_id',
+    'ix_projects_key',
+    'ix_comments_task_id_id',
+    'ix_notifications_recipient_id_is_read_created_at',
+    'ix_notifications_recipient_id_created_at_id',
+    'ix_project_members_user_id',
+    'uq_project_members_project_id_user_id',
+    'ix_audit_logs_task_id',
+)
+
+
+def rekey_duplicates() -> None:
+    # The old allocators handed out the same key more than once: every project
+    # of a prefix got the bare prefix, and task numbers came from the task count,
+    # so they were reused after a delete. The first holder of a key keeps it.
+
+    # Later projects append their id, which stays clear of the three-character
+    # keys the old allocator made; their tasks follow the new project key.
+    op.execute(
+        'WITH renamed AS ('
+        'SELECT id, key AS old_key, key || id AS new_key FROM ('
+        'SELECT id, key, row_number() OVER (PARTITION BY key ORDER BY id) AS n '
+        'FROM projects WHERE key IS NOT NULL) AS numbered WHERE n > 1'
+        '), moved AS ('
+        'UPDATE projects SET key = renamed.new_key FROM renamed WHERE projects.id = renamed.id'
+        ') '
+        'UPDATE tasks SET key = renamed.new_key || substring(tasks.key FROM length(renamed.old_key) + 1) '
+        'FROM renamed WHERE tasks.project_id = renamed.id '
+        'AND left(tasks.key, length(renamed.old_key)) = renamed.old_key'
+    )
+
+    # Later tasks take the next numbers after their project's highest.
+    op.execute(
+        'WITH duplicates AS ('
+        'SELECT id, project_id, row_number() OVER (PARTITION BY project_id ORDER BY id) AS offset_ '
+        'FROM (SELECT id, project_id, row_number() OVER (PARTITION BY key ORDER BY id) AS n '
+        'FROM tasks WHERE key IS NOT NULL) AS numbered WHERE n > 1'
+        '), highest AS ('
+        "SELECT project_id, max(substring(key FROM '-([0-9]+)$')::integer) AS number "
+        'FROM tasks GROUP BY project_id'
+        ') '
+        "UPDATE tasks SET key = projects.key || '-' || (coalesce(highest.number, 0) + duplicates.offset_) "
+        'FROM duplicates JOIN projects ON projects.id = duplicates.project_id '
+        'LEFT JOIN highest ON highest.project_id = duplicates.project_id '
+        'WHERE tasks.id = duplicates.id'
+    )
+
+    bind = op.get_bind()
+    for table in ('projects', 'tasks'):
+        duplicates = bind.scalars(sa.text(
+            f'SELECT key FROM {table} WHERE key IS NOT NULL GROUP BY key HAVING count(*) > 1 LIMIT 10'
+        )).all()
+        if duplicates:
+            raise RuntimeError(
+                f'{table}.key still has duplicates after rekeying ({", ".join(duplicates)}); '
+                'give them unique keys by hand and run the upgrade again'
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rekey_duplicates()
+
+    # Duplicate memberships would make the unique index build fail.
+    op.execute(
+        'DELETE FROM project_members a USING project_members b '
+        'WHERE a.project_id = b.project_id AND a.user_id = b.user_id AND a.id > b.id'
+    )
+
+    bind = op.get_bind()
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        # A failed concurrent build leaves an INVALID index behind, and the
+        # ones built before it stay, so a rerun drops the former and skips the latter.
+        for name in INDEXES:
+            invalid = bind.scalar(sa.text(
+                'SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)'
+            ), {'name': name})
+            if invalid:
+                op.execute(f'DROP INDEX CONCURRENTLY {name}')
+
+        op.create_index('ix_tasks_key', 'tasks', ['key'], unique=True, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_project_id_id', 'tasks', ['project_id', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_project_id_status_id', 'tasks', ['project_id', 'status_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_assignee_id', 'tasks', ['assignee_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_projects_key', 'projects', ['key'], unique=True, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_comments_task_id_id', 'comments', ['task_id', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_notifications_recipient_id_is_read_created_at', 'notifications', ['recipient_id', 'is_read', 'created_at'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_notifications_recipient_id_created_at_id', 'notifications', ['recipient_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_project_members_user_id', 'project_members', ['user_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('uq_project_members_project_id_user_id', 'project_members', ['project_id', 'user_id'], unique=True, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_audit_logs_task_id', 'audit_logs', ['task_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+        op.execute(
+            'ALTER TABLE project_members ADD CONSTRAINT uq_project_members_project_id_user_id '
+            'UNIQUE USING INDEX uq_project_members_project_id_user_id'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_constraint('uq_project_members_project_id_user_id', 'project_members', type_='unique')
+        op.drop_index('ix_audit_logs_task_id', table_name='audit_logs', postgresql_concurrently=True)
+        op.drop_index('ix_project_members_user_id', table_name='project_members', postgresql_concurrently=True)
+        op.drop_index('ix_notifications_recipient_id_created_at_id', table_name='notifications', postgresql_concurrently=True)
+        op.drop_index('ix_notifications_recipient_id_is_read_created_at', table_name='notifications', postgresql_concurrently=True)
+        op.drop_index('ix_comments_task_id_id', table_name='comments', postgresql_concurrently=True)
+        op.drop_index('ix_projects_key', table_name='projects', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_assignee_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_project_id_status_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_project_id_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_key', table_name='tasks', postgresql_concurrently=True)
@@ -0,0 +1,88 @@
+"""partition audit_logs and notifications
+
+Revision ID: 5b2d8e7c1f40
+Revises: c4e81b2f6a09
+Create Date: 2026-10-18 12:20:41.518304
+
+"""
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2d8e7c1f40'
+down_revision: str | Sequence[str] | None = 'c4e81b2f6a09'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PARTITION_KEYS = {'audit_logs': 'timestamp', 'notifications': 'created_at'}
+MONTHS_AHEAD = 3
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    month = moment.month - 1 + months
+    return moment.replace(year=moment.year + month // 12, month=month % 12 + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    op.execute("SET LOCAL TIME ZONE 'UTC'")
+
+    for table, key in PARTITION_KEYS.items():
+        legacy = f'{table}_legacy'
+        inspector = sa.inspect(bind)
+        indexes = inspector.get_indexes(table)
+        foreign_keys = inspector.get_foreign_keys(table)
+
+        # The existing table becomes the first partition as is, so no rows are copied.
+        op.rename_table(table, legacy)
+        op.drop_constraint(f'{table}_pkey', legacy, type_='primary')
+        for index in indexes:
+            op.execute(f'ALTER INDEX {index["name"]} RENAME TO {index["name"]}_legacy')
+
+        op.execute(f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE ("{key}")')
+        op.create_primary_key(f'{table}_pkey', table, ['id', key])
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+        for fk in foreign_keys:
+            op.create_foreign_key(fk['name'], table, fk['referred_table'], fk['constrained_columns'], fk['referred_columns'], ondelete=fk['options'].get('ondelete'))
+        for index in indexes:
+            op.create_index(index['name'], table, index['column_names'], unique=index['unique'])
+
+        # Matching indexes and foreign keys on the legacy table are adopted, not rebuilt.
+        upper = bind.scalar(sa.text(f'SELECT date_trunc(\'month\', greatest(now(), max("{key}"))) + interval \'1 month\' FROM {legacy}'))
+        op.execute(f"ALTER TABLE {table} ATTACH PARTITION {legacy} FOR VALUES FROM (MINVALUE) TO ('{upper.isoformat()}')")
+
+        start = upper.replace(tzinfo=UTC) if upper.tzinfo is None else upper
+        until = add_months(datetime.now(UTC), MONTHS_AHEAD + 1)
+        while start < until:
+            end = add_months(start, 1)
+            op.execute(f"CREATE TABLE {table}_p{start:%Y_%m} PARTITION OF {table} FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')")
+            start = end
+
+        # Catches rows past the last month, should maintenance fall behind.
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+
+    for table in PARTITION_KEYS:
+        legacy = f'{table}_legacy'
+
+        op.execute(f'ALTER TABLE {table} DETACH PARTITION {legacy}')
+        op.execute(f'INSERT INTO {legacy} SELECT * FROM {table}')
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {legacy}.id')
+        op.drop_table(table)
+
+        primary_key = sa.inspect(bind).get_pk_constraint(legacy)['name']
+        op.drop_constraint(primary_key, legacy, type_='primary')
+        op.rename_table(legacy, table)
+        op.create_primary_key(f'{table}_pkey', table, ['id'])
+        for index in sa.inspect(bind).get_indexes(table):
+            if index['name'].endswith('_legacy'):
+                op.execute(f'ALTER INDEX {index["name"]} RENAME TO {index["name"].removesuffix("_legacy")}')
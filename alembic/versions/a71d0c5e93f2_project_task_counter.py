@@ -0,0 +1,38 @@
+"""project task counter
+
+Revision ID: a71d0c5e93f2
+Revises: 3f9c2a7d41be
+Create Date: 2026-10-18 10:03:27.904117
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71d0c5e93f2'
+down_revision: str | Sequence[str] | None = '3f9c2a7d41be'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('task_counter', sa.Integer(), server_default='0', nullable=False))
+
+    # Continue numbering after the highest key already handed out, not the row count.
+    op.execute(
+        "UPDATE projects SET task_counter = sub.max_number "
+        "FROM ("
+        "SELECT project_id, max(substring(key FROM '-([0-9]+)$')::integer) AS max_number "
+        "FROM tasks GROUP BY project_id"
+        ") AS sub "
+        "WHERE projects.id = sub.project_id AND sub.max_number IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('projects', 'task_counter')
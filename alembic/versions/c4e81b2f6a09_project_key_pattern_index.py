@@ -0,0 +1,29 @@
+"""project key pattern index
+
+Revision ID: c4e81b2f6a09
+Revises: a71d0c5e93f2
+Create Date: 2026-10-18 10:41:52.336801
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e81b2f6a09'
+down_revision: str | Sequence[str] | None = 'a71d0c5e93f2'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # varchar_pattern_ops lets LIKE 'PRE%' use the index under any collation.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_projects_key_pattern', 'projects', ['key'], unique=False, postgresql_ops={'key': 'varchar_pattern_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_projects_key_pattern', table_name='projects', postgresql_ops={'key': 'varchar_pattern_ops'}, postgresql_concurrently=True)
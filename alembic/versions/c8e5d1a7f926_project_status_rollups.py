@@ -0,0 +1,64 @@
+"""project status rollups
+
+Revision ID: c8e5d1a7f926
+Revises: f2c7a9e4b1d3
+Create Date: 2026-10-18 16:41:09.318472
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e5d1a7f926'
+down_revision: str | Sequence[str] | None = 'f2c7a9e4b1d3'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_status_rollups',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('status_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('entered', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('exited', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('entered_age', sa.BigInteger(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['status_id'], ['statuses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id', 'status_id', 'day')
+    )
+
+    # Past moves are not recorded, so history is approximated from the tasks:
+    # open tasks entered their status when created; done tasks sat in the
+    # first status from creation until their last update, then entered done.
+    op.execute(
+        "INSERT INTO project_status_rollups "
+        "(project_id, status_id, day, entered, exited, entered_age) "
+        "SELECT project_id, status_id, day, sum(entered), sum(exited), sum(entered_age) "
+        "FROM ("
+        "SELECT t.project_id, t.status_id, (t.created_at AT TIME ZONE 'UTC')::date AS day, "
+        "1 AS entered, 0 AS exited, 0::bigint AS entered_age "
+        "FROM tasks t JOIN statuses s ON s.id = t.status_id WHERE s.name <> 'DONE' "
+        "UNION ALL "
+        "SELECT t.project_id, first.id, (moved.at AT TIME ZONE 'UTC')::date, "
+        "moved.entered, 1 - moved.entered, 0 "
+        "FROM tasks t JOIN statuses s ON s.id = t.status_id "
+        "CROSS JOIN (SELECT min(id) AS id FROM statuses WHERE name <> 'DONE') AS first "
+        "CROSS JOIN LATERAL (VALUES (t.created_at, 1), (t.updated_at, 0)) AS moved (at, entered) "
+        "WHERE s.name = 'DONE' AND first.id IS NOT NULL "
+        "UNION ALL "
+        "SELECT t.project_id, t.status_id, (t.updated_at AT TIME ZONE 'UTC')::date, 1, 0, "
+        "greatest(extract(epoch FROM t.updated_at - t.created_at), 0)::bigint "
+        "FROM tasks t JOIN statuses s ON s.id = t.status_id WHERE s.name = 'DONE'"
+        ") AS changes "
+        "GROUP BY project_id, status_id, day"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('project_status_rollups')
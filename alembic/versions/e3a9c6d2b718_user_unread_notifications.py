@@ -0,0 +1,37 @@
+"""user unread notifications counter
+
+Revision ID: e3a9c6d2b718
+Revises: 5b2d8e7c1f40
+Create Date: 2026-10-18 13:05:12.804117
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9c6d2b718'
+down_revision: str | Sequence[str] | None = '5b2d8e7c1f40'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('unread_notifications', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        "UPDATE users SET unread_notifications = sub.unread "
+        "FROM ("
+        "SELECT recipient_id, count(*) AS unread "
+        "FROM notifications WHERE NOT is_read GROUP BY recipient_id"
+        ") AS sub "
+        "WHERE users.id = sub.recipient_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'unread_notifications')
@@ -0,0 +1,32 @@
+"""board window index
+
+Revision ID: f2c7a9e4b1d3
+Revises: b6d1f4a8e2c3
+Create Date: 2026-10-18 15:02:41.730914
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7a9e4b1d3'
+down_revision: str | Sequence[str] | None = 'b6d1f4a8e2c3'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The board numbers each status's tasks by id; with id in the index that
+    # window reads it in order, without a sort. It covers the old index too.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_project_id_status_id_id', 'tasks', ['project_id', 'status_id', 'id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_tasks_project_id_status_id', table_name='tasks', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_project_id_status_id', 'tasks', ['project_id', 'status_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_tasks_project_id_status_id_id', table_name='tasks', postgresql_concurrently=True)
@@ -1,21 +1,24 @@
 from datetime import UTC, datetime, timedelta
+from time import time
 
 from fastapi import Request, Response
 from jose import jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from starlette_admin.auth import AuthProvider
 from starlette_admin.exceptions import LoginFailed
 
-from app.dependencies import get_db
+from app.database import SessionLocal
 from app.enums import RoleEnum
 from app.models import User
+from app.services import admin_auth_cache, invalidate_cached_user
 from app.settings import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
+    ADMIN_AUTH_CACHE_TTL,
     ADMIN_REMEMBER_ME_EXPIRE_MINUTES,
     ALGORITHM,
     SECRET_KEY,
 )
-from app.utils import verify_password
+from app.utils import verify_and_update_password
 
 
 class JSONAuthProvider(AuthProvider):
@@ -27,17 +30,25 @@ class JSONAuthProvider(AuthProvider):
         request: Request,
         response: Response,
     ):
-        db: Session = next(get_db())
-        user = db.query(User).filter(User.email == email).first()
+        async with SessionLocal() as db:
+            user = await db.scalar(select(User).where(User.email == email))
 
-        if not user:
-            raise LoginFailed("User not found.")
+            if not user:
+                raise LoginFailed("User not found.")
 
-        if user and user.role != RoleEnum.admin:
-            raise LoginFailed("User is not admin.")
+            if user and user.role != RoleEnum.admin:
+                raise LoginFailed("User is not admin.")
 
-        if not verify_password(password, user.password):
-            raise LoginFailed("Invalid password.")
+            is_valid, new_hash = await verify_and_update_password(
+                password, user.password
+            )
+            if not is_valid:
+                raise LoginFailed("Invalid password.")
+
+            if new_hash:
+                user.password = new_hash
+                await db.commit()
+                invalidate_cached_user(user.email)
 
         if remember_me:
             access_token_expires = timedelta(minutes=ADMIN_REMEMBER_ME_EXPIRE_MINUTES)
@@ -67,23 +78,34 @@ class JSONAuthProvider(AuthProvider):
         if not token:
             return None
 
+        # Runs for every admin page and asset, so a verified token is reused
+        # for a few seconds instead of hitting the database each time.
+        user = admin_auth_cache.get(token)
+
+        if user is not None:
+            return user
+
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             email: str = payload.get("sub")
             if email is None:
                 return None
 
-            db: Session = next(get_db())
-            user = db.query(User).filter(User.email == email).first()
+            async with SessionLocal() as db:
+                user = await db.scalar(select(User).where(User.email == email))
 
             if user is None or user.role != RoleEnum.admin:
                 return None
 
+            ttl = min(ADMIN_AUTH_CACHE_TTL, payload["exp"] - time())
+            admin_auth_cache.set(token, user, ttl=ttl)
+
             return user
 
         except jwt.JWTError:
             return None
 
     async def logout(self, request: Request, response: Response) -> Response:
+        admin_auth_cache.pop(request.cookies.get("access_token"))
         response.delete_cookie("access_token")
         return response
@@ -0,0 +1,44 @@
+from typing import Any, ClassVar
+
+from starlette.requests import Request
+
+from app.cache import TTLCache
+from app.database import estimate_row_count
+from app.enums import CountStrategyEnum
+from app.settings import ADMIN_COUNT_CACHE_TTL
+
+count_cache = TTLCache(maxsize=100, ttl=ADMIN_COUNT_CACHE_TTL)
+
+
+class CountStrategyMixin:
+	"""Opt-in cheaper totals for the list page pagination.
+
+	``estimate`` reads the planner's row estimate from pg_class, and
+	``cached`` keeps the exact count for ADMIN_COUNT_CACHE_TTL seconds.
+	Filtered or searched lists are always counted exactly.
+	"""
+
+	count_strategy: ClassVar[CountStrategyEnum] = CountStrategyEnum.exact
+
+	async def count(
+		self, request: Request, where: dict[str, Any] | str | None = None
+	) -> int:
+		if where is not None or self.count_strategy == CountStrategyEnum.exact:
+			return await super().count(request, where)
+
+		if self.count_strategy == CountStrategyEnum.estimate:
+			estimate = await estimate_row_count(
+				request.state.session, self.model.__tablename__
+			)
+
+			# Never analyzed yet, so there is nothing to estimate from.
+			if estimate is not None:
+				return estimate
+
+		total = count_cache.get(self.identity)
+
+		if total is None:
+			total = await super().count(request)
+			count_cache.set(self.identity, total)
+
+		return total
@@ -0,0 +1,222 @@
+import asyncio
+import csv
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, ClassVar
+from uuid import uuid4
+
+from sqlalchemy import Select, inspect, select
+from starlette.background import BackgroundTask
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, Response
+from starlette.routing import Route
+from starlette_admin import BaseModelView
+
+from app.database import SessionLocal, estimate_row_count
+from app.enums import ExportFormatEnum
+from app.services import export_response
+from app.services.exports import stream_partitions
+from app.settings import (
+	ADMIN_BACKGROUND_EXPORT_ROWS,
+	ADMIN_EXPORT_DIR,
+	ADMIN_EXPORT_TTL,
+	ADMIN_MAX_LIST_ROWS,
+)
+
+# A job lives in ADMIN_EXPORT_DIR as <job_id>.json next to its CSV, so any
+# worker that shares the directory can answer a status poll.
+JOB_ID = re.compile(r"[0-9a-f]{32}")
+
+running_exports: set[asyncio.Task] = set()
+
+
+class StreamingExportMixin:
+	"""Bounded list queries plus a streaming CSV export for large tables.
+
+	The built-in csv/excel/pdf/print buttons export whatever the list API
+	returned, so capping the list caps them too. Full-table exports go
+	through ``/admin/exports/<identity>/`` instead, which streams from a
+	server-side cursor and switches to a background job for huge tables.
+	"""
+
+	max_list_rows: ClassVar[int] = ADMIN_MAX_LIST_ROWS
+	background_export_rows: ClassVar[int] = ADMIN_BACKGROUND_EXPORT_ROWS
+
+	async def find_all(
+		self,
+		request: Request,
+		skip: int = 0,
+		limit: int = 100,
+		where: dict[str, Any] | str | None = None,
+		order_by: list[str] | None = None,
+	):
+		# A limit of -1 is starlette-admin's "All".
+		if limit <= 0 or limit > self.max_list_rows:
+			limit = self.max_list_rows
+
+		return await super().find_all(request, skip, limit, where, order_by)
+
+	def get_export_query(self) -> Select:
+		mapper = inspect(self.model)
+		columns = []
+
+		for name in self.export_fields:
+			if name in mapper.columns:
+				columns.append(mapper.columns[name])
+			elif name in mapper.relationships:
+				columns.extend(mapper.relationships[name].local_columns)
+
+		return select(*columns).order_by(*mapper.primary_key)
+
+	async def export(self, request: Request) -> Response:
+		stmt = self.get_export_query()
+
+		async with SessionLocal() as db:
+			estimate = await estimate_row_count(db, self.model.__tablename__)
+
+		if request.query_params.get("background") or (
+			estimate and estimate > self.background_export_rows
+		):
+			job_id = start_export_job(stmt, self.identity)
+			status_url = request.url_for("admin:export-job", job_id=job_id)
+
+			return JSONResponse(
+				{"job_id": job_id, "status_url": str(status_url)}, status_code=202
+			)
+
+		return export_response(stmt, ExportFormatEnum.csv, self.identity)
+
+
+def job_path(job_id: str) -> Path:
+	return ADMIN_EXPORT_DIR / f"{job_id}.json"
+
+
+def save_export_job(job_id: str, job: dict):
+	# Written aside and renamed, so readers never see half a file.
+	part = job_path(job_id).with_suffix(".part")
+	part.write_text(json.dumps(job))
+	part.replace(job_path(job_id))
+
+
+def load_export_job(job_id: str) -> dict | None:
+	if not JOB_ID.fullmatch(job_id):
+		return None
+
+	try:
+		return json.loads(job_path(job_id).read_text())
+	except FileNotFoundError:
+		return None
+
+
+async def write_export(job_id: str, job: dict, stmt: Select):
+	path = ADMIN_EXPORT_DIR / job["filename"]
+	part = path.with_suffix(".part")
+
+	try:
+		with part.open("w", newline="") as file:
+			writer = csv.writer(file)
+			writer.writerow(stmt.selected_columns.keys())
+
+			# Counted by rows written, not lines: quoted fields can hold newlines.
+			async for rows in stream_partitions(stmt):
+				await asyncio.to_thread(writer.writerows, rows)
+				job["rows"] += len(rows)
+				await asyncio.to_thread(save_export_job, job_id, job)
+
+		part.replace(path)
+	except Exception:
+		job["status"] = "failed"
+		part.unlink(missing_ok=True)
+		save_export_job(job_id, job)
+		raise
+
+	job["status"] = "done"
+	save_export_job(job_id, job)
+
+
+def prune_export_files(ttl: int = ADMIN_EXPORT_TTL):
+	"""Remove export files untouched for ttl seconds.
+
+	Covers files that were never downloaded and jobs whose worker died;
+	a running job rewrites its files with every chunk.
+	"""
+	cutoff = time.time() - ttl
+
+	for path in ADMIN_EXPORT_DIR.iterdir():
+		try:
+			if path.stat().st_mtime < cutoff:
+				path.unlink()
+		except FileNotFoundError:
+			continue
+
+
+def start_export_job(stmt: Select, identity: str) -> str:
+	ADMIN_EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+	prune_export_files()
+
+	job_id = uuid4().hex
+	job = {"status": "running", "rows": 0, "filename": f"{identity}-{job_id}.csv"}
+	save_export_job(job_id, job)
+
+	task = asyncio.create_task(write_export(job_id, job, stmt))
+	running_exports.add(task)
+	task.add_done_callback(running_exports.discard)
+
+	return job_id
+
+
+def discard_export_job(job_id: str, job: dict):
+	(ADMIN_EXPORT_DIR / job["filename"]).unlink(missing_ok=True)
+	job_path(job_id).unlink(missing_ok=True)
+
+
+def export_routes(views: list[BaseModelView]) -> list[Route]:
+	views_by_identity = {view.identity: view for view in views}
+
+	async def export_view(request: Request) -> Response:
+		view = views_by_identity.get(request.path_params["identity"])
+
+		if view is None:
+			raise HTTPException(status_code=404)
+
+		if not view.is_accessible(request) or not isinstance(
+			view, StreamingExportMixin
+		):
+			raise HTTPException(status_code=403)
+
+		return await view.export(request)
+
+	async def export_job(request: Request) -> Response:
+		job_id = request.path_params["job_id"]
+		job = load_export_job(job_id)
+
+		if not job:
+			raise HTTPException(status_code=404)
+
+		if job["status"] != "done":
+			return JSONResponse(
+				{"status": job["status"], "rows": job["rows"]},
+				status_code=500 if job["status"] == "failed" else 202,
+			)
+
+		path = ADMIN_EXPORT_DIR / job["filename"]
+
+		# Already served, by this worker or another.
+		if not path.exists():
+			raise HTTPException(status_code=404)
+
+		# Each file is served once, then removed.
+		return FileResponse(
+			path,
+			media_type="text/csv",
+			filename=job["filename"],
+			background=BackgroundTask(discard_export_job, job_id, job),
+		)
+
+	return [
+		Route("/exports/jobs/{job_id}/", export_job, name="export-job"),
+		Route("/exports/{identity}/", export_view, name="export"),
+	]
@@ -1,6 +1,7 @@
 from starlette_admin.contrib.sqla import Admin
 
 from app.admin.auth import JSONAuthProvider
+from app.admin.exports import export_routes
 from app.admin.views import (
     AuditLogAdminView,
     CommentAdminView,
@@ -30,11 +31,18 @@ admin = Admin(
     auth_provider=JSONAuthProvider(login_path="/login", logout_path="/logout"),
 )
 
-admin.add_view(UserAdminView(User, icon="fa fa-user"))
-admin.add_view(ProjectAdminView(Project, icon="fa fa-suitcase"))
-admin.add_view(ProjectMemberAdminView(ProjectMember, icon="fa fa-users"))
-admin.add_view(TaskAdminView(Task, icon="fa fa-tasks"))
-admin.add_view(StatusAdminView(Status, icon="fa fa-tasks"))
-admin.add_view(CommentAdminView(Comment, icon="fa fa-comment"))
-admin.add_view(NotificationAdminView(Notification, icon="fa fa-bell"))
-admin.add_view(AuditLogAdminView(AuditLog, icon="fa fa-history"))
+views = [
+    UserAdminView(User, icon="fa fa-user"),
+    ProjectAdminView(Project, icon="fa fa-suitcase"),
+    ProjectMemberAdminView(ProjectMember, icon="fa fa-users"),
+    TaskAdminView(Task, icon="fa fa-tasks"),
+    StatusAdminView(Status, icon="fa fa-tasks"),
+    CommentAdminView(Comment, icon="fa fa-comment"),
+    NotificationAdminView(Notification, icon="fa fa-bell"),
+    AuditLogAdminView(AuditLog, icon="fa fa-history"),
+]
+
+for view in views:
+    admin.add_view(view)
+
+admin.routes.extend(export_routes(views))
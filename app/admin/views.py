@@ -8,7 +8,10 @@ from starlette.requests import Request
 from starlette_admin.contrib.sqla import ModelView
 from starlette_admin.fields import EnumField, ImageField, PasswordField
 
-from app.enums import RoleEnum, StatusEnum
+from app.admin.counts import CountStrategyMixin
+from app.admin.exports import StreamingExportMixin
+from app.enums import CountStrategyEnum, RoleEnum
+from app.services import invalidate_cached_user
 from app.settings import MEDIA_PATH
 from app.utils import hash_password
 
@@ -45,13 +48,30 @@ class UserAdminView(ModelView):
 
 	async def create(self, request: Request, data: dict[str, Any]):
 		if "password" in data:
-			data["password"] = hash_password(data["password"])
+			data["password"] = await hash_password(data["password"])
 
 		print("Create is working!")
 		print("=======================", "avatar" in data, data["avatar"])
 
 		return await super().create(request, data)
 
+	async def edit(self, request: Request, pk: Any, data: dict[str, Any]):
+		user = await self.find_by_pk(request, pk)
+		old_email = user.email if user else None
+
+		user = await super().edit(request, pk, data)
+		invalidate_cached_user(*filter(None, [old_email, user.email]))
+
+		return user
+
+	async def delete(self, request: Request, pks: list[Any]):
+		emails = [user.email for user in await self.find_by_pks(request, pks)]
+
+		deleted = await super().delete(request, pks)
+		invalidate_cached_user(*emails)
+
+		return deleted
+
 	async def _handle_avatar_upload(self, file: UploadFile) -> str | None:
 		file_name_original = os.path.splitext(file.filename)[0]
 		file_ext = os.path.splitext(file.filename)[1]
@@ -117,14 +137,15 @@ class ProjectMemberAdminView(ModelView):
 	export_types: ClassVar[list[str]] = ["csv", "excel", "pdf", "print"]
 
 
-class TaskAdminView(ModelView):
+class TaskAdminView(CountStrategyMixin, StreamingExportMixin, ModelView):
+	count_strategy: ClassVar[CountStrategyEnum] = CountStrategyEnum.cached
 	fields: ClassVar[list[str]] = [
 		"id",
 		"key",
 		"summary",
 		"description",
 		"project",
-		EnumField("status", enum=StatusEnum),
+		"status",
 		"priority",
 		"assignee",
 		"reporter",
@@ -176,7 +197,8 @@ class StatusAdminView(ModelView):
 	export_types: ClassVar[list[str]] = ["csv", "excel", "pdf", "print"]
 
 
-class CommentAdminView(ModelView):
+class CommentAdminView(CountStrategyMixin, StreamingExportMixin, ModelView):
+	count_strategy: ClassVar[CountStrategyEnum] = CountStrategyEnum.cached
 	fields: ClassVar[list[str]] = [
 		"id",
 		"task",
@@ -199,7 +221,8 @@ class CommentAdminView(ModelView):
 	export_types: ClassVar[list[str]] = ["csv", "excel", "pdf", "print"]
 
 
-class NotificationAdminView(ModelView):
+class NotificationAdminView(CountStrategyMixin, StreamingExportMixin, ModelView):
+	count_strategy: ClassVar[CountStrategyEnum] = CountStrategyEnum.estimate
 	fields: ClassVar[list[str]] = [
 		"id",
 		"recipient",
@@ -228,7 +251,8 @@ class NotificationAdminView(ModelView):
 	export_types: ClassVar[list[str]] = ["csv", "excel", "pdf", "print"]
 
 
-class AuditLogAdminView(ModelView):
+class AuditLogAdminView(CountStrategyMixin, StreamingExportMixin, ModelView):
+	count_strategy: ClassVar[CountStrategyEnum] = CountStrategyEnum.estimate
 	fields: ClassVar[list[str]] = [
 		"id",
 		"user",
@@ -1,13 +1,92 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from time import perf_counter
 
-from app.settings import DB_URL
+from sqlalchemy import exc, make_url, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.settings import (
+	ASYNC_DB_URL,
+	DB_ECHO,
+	DB_MAX_OVERFLOW,
+	DB_POOL_PRE_PING,
+	DB_POOL_RECYCLE,
+	DB_POOL_SIZE,
+	DB_POOL_TIMEOUT,
+	DB_URL,
+)
 
 DB_URL = DB_URL
+ASYNC_DB_URL = ASYNC_DB_URL or make_url(DB_URL).set(drivername="postgresql+asyncpg")
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.checkouts = 0
+		self.checkout_timeouts = 0
+		self.wait_time_total = 0.0
+		self.wait_time_max = 0.0
+
+	def connect(self):
+		started = perf_counter()
+		try:
+			connection = super().connect()
+		except exc.TimeoutError:
+			self.checkout_timeouts += 1
+			raise
+
+		waited = perf_counter() - started
+		self.checkouts += 1
+		self.wait_time_total += waited
+		self.wait_time_max = max(self.wait_time_max, waited)
+
+		return connection
+
+	def stats(self) -> dict:
+		return {
+			"size": self.size(),
+			"checked_out": self.checkedout(),
+			"idle": self.checkedin(),
+			"overflow": max(self.overflow(), 0),
+			"max_overflow": self._max_overflow,
+			"checkouts": self.checkouts,
+			"checkout_timeouts": self.checkout_timeouts,
+			"wait_time_avg_ms": self.wait_time_total / max(self.checkouts, 1) * 1000,
+			"wait_time_max_ms": self.wait_time_max * 1000,
+		}
+
+
+engine = create_async_engine(
+	url=ASYNC_DB_URL,
+	echo=DB_ECHO,
+	poolclass=InstrumentedPool,
+	pool_size=DB_POOL_SIZE,
+	max_overflow=DB_MAX_OVERFLOW,
+	pool_timeout=DB_POOL_TIMEOUT,
+	pool_recycle=DB_POOL_RECYCLE,
+	pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+SessionLocal = async_sessionmaker(bind=engine, autocommit=False, expire_on_commit=False)
+
+
+def get_pool_stats() -> dict:
+	return engine.pool.stats()
 
-engine = create_engine(url=DB_URL, echo=True)
 
-SessionLocal = sessionmaker(bind=engine, autocommit=False)
+async def estimate_row_count(db: AsyncSession, table_name: str) -> int | None:
+	# Planner estimate from the last ANALYZE, summed over the partitions of a
+	# partitioned table; None if nothing was analyzed yet.
+	return await db.scalar(
+		text(
+			"SELECT CASE WHEN max(reltuples) >= 0 "
+			"THEN sum(greatest(reltuples, 0))::bigint END "
+			"FROM pg_class WHERE oid = to_regclass(:name) OR oid IN "
+			"(SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:name))"
+		),
+		{"name": table_name},
+	)
 
 
 class Base(DeclarativeBase):
@@ -1,25 +1,35 @@
 from typing import Annotated
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import SessionLocal
 from app.enums import RoleEnum
 from app.models import User
-from app.settings import ALGORITHM, SECRET_KEY
+from app.schemas import PageParams
+from app.services import cache_user, get_cached_user
+from app.settings import ALGORITHM, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SECRET_KEY
 
 
-def get_db():
-	db = SessionLocal()
-	try:
+async def get_db():
+	async with SessionLocal() as db:
 		yield db
-	finally:
-		db.close()
 
 
-db_dep = Annotated[Session, Depends(get_db)]
+db_dep = Annotated[AsyncSession, Depends(get_db)]
+
+
+async def get_page_params(
+	cursor: str | None = None,
+	limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+):
+	return PageParams(cursor=cursor, limit=limit)
+
+
+page_dep = Annotated[PageParams, Depends(get_page_params)]
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
@@ -40,9 +50,12 @@ async def get_current_user(db: db_dep, token: oauth2_scheme_dep):
 		if email is None:
 			raise HTTPException(status_code=401, detail="Invalid refresh token")
 
-		user = db.query(User).filter(User.email == email).first()
-		if not user:
-			raise HTTPException(status_code=401, detail="User not found")
+		user = await get_cached_user(db, email)
+		if user is None:
+			user = await db.scalar(select(User).where(User.email == email))
+			if not user:
+				raise HTTPException(status_code=401, detail="User not found")
+			cache_user(user)
 
 		if not user.is_active:
 			raise HTTPException(status_code=400, detail="Inactive user")
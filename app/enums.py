@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, StrEnum
 
 
 class RoleEnum(str, Enum):
@@ -14,3 +14,14 @@ class StatusEnum(str, Enum):
     IN_PROGRESS = "IN_PROGRESS"
     READY_FOR_TEST = "READY_FOR_TEST"
     DONE = "DONE"
+
+
+class ExportFormatEnum(StrEnum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class CountStrategyEnum(StrEnum):
+    exact = "exact"
+    estimate = "estimate"
+    cached = "cached"
@@ -1,14 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 from fastapi.staticfiles import StaticFiles
 
 from app.admin.settings import admin
+from app.responses import FastJSONResponse
 from app.routers.auth import router as auth_router
+from app.routers.comments import router as comments_router
+from app.routers.metrics import router as metrics_router
+from app.routers.notifications import router as notifications_router
 from app.routers.projects import router as projects_router
 from app.routers.tasks import router as tasks_router
+from app.routers.users import router as users_router
+from app.services import audit_writer, notification_broker, response_cache
 from app.settings import MEDIA_DIR, MEDIA_URL
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    audit_writer.start()
+    await notification_broker.start()
+    await response_cache.start()
+    yield
+    await response_cache.stop()
+    await notification_broker.stop()
+    await audit_writer.stop()
+
+
+# The stdlib-rendered JSONResponse is FastAPI's default; FastJSONResponse
+# renders every response with orjson.
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 
 @app.get("/")
@@ -19,6 +41,10 @@ async def hello():
 app.include_router(auth_router)
 app.include_router(projects_router)
 app.include_router(tasks_router)
+app.include_router(comments_router)
+app.include_router(users_router)
+app.include_router(notifications_router)
+app.include_router(metrics_router)
 
 
 def custom_openapi():
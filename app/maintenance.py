@@ -0,0 +1,311 @@
+"""Partition maintenance for the append-only tables.
+
+audit_logs and notifications are range-partitioned by month, with a
+default partition for rows outside every month. Run this daily, for
+example from cron, so that rows land in their month's partition and
+expired months are removed as a whole. It also corrects the
+users' unread notification counters, which drift when notifications are
+deleted along with their task or partition, and the project status
+rollups, which miss task changes made in the admin panel:
+
+    python -m app.maintenance
+"""
+
+import asyncio
+import re
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.database import engine
+from app.settings import (
+    AUDIT_LOG_RETENTION_DAYS,
+    MAINTENANCE_BATCH_SIZE,
+    NOTIFICATION_RETENTION_DAYS,
+    PARTITION_DETACH_EXPIRED,
+    PARTITION_MONTHS_AHEAD,
+)
+
+PARTITIONED_TABLES = {
+    "audit_logs": AUDIT_LOG_RETENTION_DAYS,
+    "notifications": NOTIFICATION_RETENTION_DAYS,
+}
+
+PARTITION_KEYS = {"audit_logs": "timestamp", "notifications": "created_at"}
+
+PARTITION_NAME = re.compile(
+    rf"^({'|'.join(PARTITIONED_TABLES)})_(legacy|default|p\d{{4}}_\d{{2}})$"
+)
+UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+def is_partition_name(name: str) -> bool:
+    return PARTITION_NAME.match(name) is not None
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    month = moment.month - 1 + months
+
+    return moment.replace(
+        year=moment.year + month // 12,
+        month=month % 12 + 1,
+        day=1,
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+
+
+async def list_partitions(
+    conn: AsyncConnection, table: str
+) -> list[tuple[str, datetime | None]]:
+    rows = await conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )
+
+    partitions = []
+
+    for name, bound in rows:
+        match = UPPER_BOUND.search(bound)
+        upper = datetime.fromisoformat(match.group(1)) if match else None
+
+        # Bounds of "timestamp without time zone" columns are read as UTC.
+        if upper is not None and upper.tzinfo is None:
+            upper = upper.replace(tzinfo=UTC)
+
+        partitions.append((name, upper))
+
+    return partitions
+
+
+async def create_partitions(
+    conn: AsyncConnection, table: str, months_ahead: int
+) -> list[str]:
+    partitions = await list_partitions(conn, table)
+    now = datetime.now(UTC)
+
+    start = max((upper for _, upper in partitions if upper), default=add_months(now, 0))
+    until = add_months(now, months_ahead + 1)
+    default = f"{table}_default"
+    key = PARTITION_KEYS[table]
+    created = []
+
+    # Inserts that no month covers land here instead of failing.
+    if default not in {name for name, _ in partitions}:
+        await conn.execute(text(f"CREATE TABLE {default} PARTITION OF {table} DEFAULT"))
+        created.append(default)
+
+    while start < until:
+        end = add_months(start, 1)
+        name = f"{table}_p{start:%Y_%m}"
+
+        # The month's rows may already sit in the default partition, which
+        # would then violate the new bound; they move into the new table
+        # before it is attached.
+        await conn.execute(
+            text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)")
+        )
+        await conn.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {default} "
+                f'WHERE "{key}" >= :start AND "{key}" < :end RETURNING *) '
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"start": start, "end": end},
+        )
+        await conn.execute(
+            text(
+                f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+        created.append(name)
+        start = end
+
+    return created
+
+
+async def prune_partitions(
+    conn: AsyncConnection, table: str, retention_days: int, detach: bool
+) -> list[str]:
+    if not retention_days:
+        return []
+
+    cutoff = datetime.now(UTC) - timedelta(days=retention_days)
+    pruned = []
+
+    # Only partitions that lie entirely before the cutoff are removed.
+    for name, upper in await list_partitions(conn, table):
+        if upper is None or upper > cutoff:
+            continue
+
+        if detach:
+            await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        else:
+            await conn.execute(text(f"DROP TABLE {name}"))
+
+        pruned.append(name)
+
+    return pruned
+
+
+async def recount_unread_batch(conn: AsyncConnection, after: int, size: int):
+    # Counter updates lock their users before they commit, and in id order, so
+    # with the batch locked the same way the counts below see each of them
+    # either finished or not yet started.
+    ids = (
+        (
+            await conn.execute(
+                text(
+                    "SELECT id FROM users WHERE id > :after ORDER BY id LIMIT :size "
+                    "FOR UPDATE"
+                ),
+                {"after": after, "size": size},
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    if not ids:
+        return None, []
+
+    rows = await conn.execute(
+        text(
+            "UPDATE users SET unread_notifications = counts.unread "
+            "FROM (SELECT users.id, (SELECT count(*) FROM notifications "
+            "WHERE recipient_id = users.id AND NOT is_read) AS unread "
+            "FROM users WHERE users.id BETWEEN :first AND :last) AS counts "
+            "WHERE users.id = counts.id "
+            "AND users.unread_notifications <> counts.unread "
+            "RETURNING users.id"
+        ),
+        {"first": ids[0], "last": ids[-1]},
+    )
+
+    return ids[-1], [f"user {user_id}" for user_id in rows.scalars()]
+
+
+async def reconcile_rollups_batch(conn: AsyncConnection, after: int, size: int):
+    ids = (
+        (
+            await conn.execute(
+                text(
+                    "SELECT id FROM projects WHERE id > :after ORDER BY id LIMIT :size"
+                ),
+                {"after": after, "size": size},
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    if not ids:
+        return None, []
+
+    # Whatever the rollups miss is booked today, so past days stay as they were.
+    rows = await conn.execute(
+        text(
+            "INSERT INTO project_status_rollups "
+            "(project_id, status_id, day, entered, exited) "
+            "SELECT project_id, status_id, current_date, "
+            "greatest(drift, 0), greatest(-drift, 0) "
+            "FROM (SELECT coalesce(tasks.project_id, rollups.project_id) AS project_id, "
+            "coalesce(tasks.status_id, rollups.status_id) AS status_id, "
+            "coalesce(tasks.count, 0) - coalesce(rollups.count, 0) AS drift "
+            "FROM (SELECT project_id, status_id, count(*) AS count FROM tasks "
+            "WHERE status_id IS NOT NULL AND project_id BETWEEN :first AND :last "
+            "GROUP BY project_id, status_id) AS tasks "
+            "FULL JOIN (SELECT project_id, status_id, sum(entered - exited) AS count "
+            "FROM project_status_rollups WHERE project_id BETWEEN :first AND :last "
+            "GROUP BY project_id, status_id) AS rollups "
+            "ON rollups.project_id = tasks.project_id "
+            "AND rollups.status_id = tasks.status_id) AS counts "
+            "WHERE drift <> 0 "
+            "ON CONFLICT (project_id, status_id, day) DO UPDATE SET "
+            "entered = project_status_rollups.entered + excluded.entered, "
+            "exited = project_status_rollups.exited + excluded.exited "
+            "RETURNING project_id, status_id"
+        ),
+        {"first": ids[0], "last": ids[-1]},
+    )
+
+    return ids[-1], [
+        f"project {project_id} status {status_id}" for project_id, status_id in rows
+    ]
+
+
+async def in_batches(batch, size: int = MAINTENANCE_BATCH_SIZE) -> list[str]:
+    """Run batch over consecutive id ranges, one short transaction each.
+
+    batch(conn, after, size) handles up to size ids above after and returns
+    the last id it covered, or None when there are none left, along with
+    what it changed.
+    """
+    changed = []
+    after = 0
+
+    while True:
+        async with engine.begin() as conn:
+            # Rollup days are UTC days.
+            await conn.execute(text("SET LOCAL TIME ZONE 'UTC'"))
+            after, names = await batch(conn, after, size)
+
+        if after is None:
+            return changed
+
+        changed += names
+
+
+async def recount_unread_notifications() -> list[str]:
+    return await in_batches(recount_unread_batch)
+
+
+async def reconcile_status_rollups() -> list[str]:
+    return await in_batches(reconcile_rollups_batch)
+
+
+async def maintain_partitions(
+    months_ahead: int = PARTITION_MONTHS_AHEAD, detach: bool = PARTITION_DETACH_EXPIRED
+) -> dict[str, dict[str, list[str]]]:
+    report = {}
+
+    # Each table's partition changes commit on their own: DETACH and DROP lock
+    # the whole table until then.
+    for table, retention_days in PARTITIONED_TABLES.items():
+        async with engine.begin() as conn:
+            # Partition bounds are read and written in UTC.
+            await conn.execute(text("SET LOCAL TIME ZONE 'UTC'"))
+
+            report[table] = {
+                "created": await create_partitions(conn, table, months_ahead),
+                "pruned": await prune_partitions(conn, table, retention_days, detach),
+            }
+
+    report["users"] = {"recounted": await recount_unread_notifications()}
+    report["project_status_rollups"] = {"corrected": await reconcile_status_rollups()}
+
+    return report
+
+
+async def main():
+    try:
+        report = await maintain_partitions()
+    finally:
+        await engine.dispose()
+
+    for table, changes in report.items():
+        for action, names in changes.items():
+            for name in names:
+                print(f"{table}: {action} {name}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
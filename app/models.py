@@ -1,4 +1,21 @@
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func
+from datetime import date
+from typing import ClassVar
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Computed,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -24,6 +41,10 @@ class User(Base, TimeStampMixin):
     role: Mapped[str] = mapped_column(String(100), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Kept in step with notifications.is_read so badges need no COUNT(*).
+    unread_notifications: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0"
+    )
 
     owned_projects: Mapped[list["Project"]] = relationship(
         "Project", back_populates="owner"
@@ -56,11 +77,19 @@ class User(Base, TimeStampMixin):
 
 class Project(Base, TimeStampMixin):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index(
+            "ix_projects_key_pattern",
+            "key",
+            postgresql_ops={"key": "varchar_pattern_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=True)
     description: Mapped[str] = mapped_column(String(255), nullable=True)
-    key: Mapped[str] = mapped_column(String(10), nullable=True)
+    key: Mapped[str] = mapped_column(String(10), nullable=True, unique=True, index=True)
+    task_counter: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_private: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -80,9 +109,16 @@ class Project(Base, TimeStampMixin):
 
 class ProjectMember(Base):
     __tablename__ = "project_members"
+    __table_args__ = (
+        UniqueConstraint(
+            "project_id", "user_id", name="uq_project_members_project_id_user_id"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
     project_id: Mapped[int] = mapped_column(
         ForeignKey("projects.id", ondelete="CASCADE")
     )
@@ -99,19 +135,38 @@ class ProjectMember(Base):
 
 class Task(Base, TimeStampMixin):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        Index("ix_tasks_project_id_status_id_id", "project_id", "status_id", "id"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     project_id: Mapped[int] = mapped_column(
         ForeignKey("projects.id", ondelete="CASCADE")
     )
-    key: Mapped[str] = mapped_column(String(20), nullable=False)
+    key: Mapped[str] = mapped_column(
+        String(20), nullable=False, unique=True, index=True
+    )
     summary: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=True)
     status_id: Mapped[str] = mapped_column(
         Integer, ForeignKey("statuses.id", ondelete="CASCADE")
     )
     priority: Mapped[str] = mapped_column(String(10), nullable=False)
-    assignee_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    # Generated by Postgres on every write; summary matches outrank description.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(summary, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+    assignee_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
     reporter_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     due_date: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=True)
 
@@ -124,8 +179,9 @@ class Task(Base, TimeStampMixin):
         "User", back_populates="reported_tasks", foreign_keys="Task.reporter_id"
     )
     comments: Mapped[list["Comment"]] = relationship("Comment", back_populates="task")
+    # The foreign key cascades; the ORM must not load and orphan the rows.
     notifications: Mapped[list["Notification"]] = relationship(
-        "Notification", back_populates="task"
+        "Notification", back_populates="task", passive_deletes=True
     )
     audit_logs: Mapped[list["AuditLog"]] = relationship(
         "AuditLog", back_populates="task"
@@ -150,11 +206,20 @@ class Status(Base):
 
 class Comment(Base, TimeStampMixin):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_task_id_id", "task_id", "id"),
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"))
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     content: Mapped[str] = mapped_column(String(255), nullable=False)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', content)", persisted=True),
+        deferred=True,
+    )
 
     task: Mapped["Task"] = relationship("Task", back_populates="comments")
     user: Mapped["User"] = relationship("User", back_populates="comments")
@@ -165,8 +230,29 @@ class Comment(Base, TimeStampMixin):
 
 class Notification(Base, TimeStampMixin):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index(
+            "ix_notifications_recipient_id_is_read_created_at",
+            "recipient_id",
+            "is_read",
+            "created_at",
+        ),
+        Index(
+            "ix_notifications_recipient_id_created_at_id",
+            "recipient_id",
+            "created_at",
+            "id",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    # Partitioned tables need the partition key in the primary key; ids are
+    # still unique, so the ORM keeps identifying rows by id alone.
+    __mapper_args__: ClassVar[dict] = {"primary_key": ["id"]}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), primary_key=True
+    )
     recipient_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE")
     )
@@ -197,15 +283,17 @@ class Notification(Base, TimeStampMixin):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = ({"postgresql_partition_by": "RANGE (timestamp)"},)
+    __mapper_args__: ClassVar[dict] = {"primary_key": ["id"]}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     task_id: Mapped[int] = mapped_column(
-        ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True
+        ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True, index=True
     )
     action: Mapped[str] = mapped_column(String(255), nullable=False)
     timestamp: Mapped[DateTime] = mapped_column(
-        DateTime(timezone=True), default=func.now()
+        DateTime(timezone=True), default=func.now(), primary_key=True
     )
 
     user: Mapped["User"] = relationship("User", back_populates="audit_logs")
@@ -213,3 +301,29 @@ class AuditLog(Base):
 
     def __str__(self):
         return f"AuditLog(user_id={self.user_id})"
+
+
+class ProjectStatusRollup(Base):
+    """Per project, status and UTC day: how many tasks entered and left it.
+
+    Kept up to date in the transactions that create, move and delete
+    tasks. A status's task count on a day is the running total of entered
+    minus exited; entered_age sums the ages, in seconds, of the entering
+    tasks.
+    """
+
+    __tablename__ = "project_status_rollups"
+
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    status_id: Mapped[int] = mapped_column(
+        ForeignKey("statuses.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    entered: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    exited: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    entered_age: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+
+    def __str__(self):
+        return f"ProjectStatusRollup(project_id={self.project_id}, day={self.day})"
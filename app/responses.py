@@ -0,0 +1,97 @@
+from collections.abc import Callable, Sequence
+from functools import cache
+from operator import itemgetter
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from sqlalchemy import Row
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson.
+
+    Z-suffixed UTC timestamps keep the output identical to pydantic's.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def model_response(schema: type[BaseModel], content: Any, **kwargs) -> Response:
+    # What response_model=schema would send, rendered by the route itself.
+    body = schema.model_validate(content, from_attributes=True).model_dump_json()
+
+    return Response(body, media_type="application/json", **kwargs)
+
+
+def field_paths(schema: type[BaseModel], prefix: tuple = ()) -> list[tuple]:
+    paths = []
+
+    for name, field in schema.model_fields.items():
+        annotation = field.annotation
+
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            paths += field_paths(annotation, (*prefix, name))
+        else:
+            paths.append((*prefix, name))
+
+    return paths
+
+
+def node_builder(tree: dict) -> Callable[[Row], dict]:
+    # A node of plain fields reads them all in one itemgetter call.
+    names = tuple(tree)
+    nested = {
+        name: node_builder(node)
+        for name, node in tree.items()
+        if isinstance(node, dict)
+    }
+
+    if not nested:
+        if len(names) == 1:
+            name, getter = names[0], itemgetter(tree[names[0]])
+            return lambda row: {name: getter(row)}
+
+        getter = itemgetter(*tree.values())
+        return lambda row: dict(zip(names, getter(row), strict=True))
+
+    getters = tuple(nested.get(name) or itemgetter(node) for name, node in tree.items())
+
+    return lambda row: {
+        name: get(row) for name, get in zip(names, getters, strict=True)
+    }
+
+
+@cache
+def row_builder(schema: type[BaseModel]) -> Callable[[Row], dict]:
+    """Build a function that turns one row into the schema's JSON shape.
+
+    The schema's row_columns are labelled with the dotted path of the field
+    they fill, e.g. ``Project.key.label("project.key")``. The labels must
+    cover the fields exactly, which is checked once, here. Rows then skip
+    ORM objects and validation entirely; nested models must be non-null,
+    i.e. come from inner joins.
+    """
+    labels = {
+        tuple(column.name.split(".")): i for i, column in enumerate(schema.row_columns)
+    }
+    paths = field_paths(schema)
+
+    if set(labels) != set(paths):
+        raise TypeError(f"{schema.__name__}.row_columns do not match its fields")
+
+    # Built in field order, so keys come out in the same order as pydantic's.
+    tree = {}
+    for path in paths:
+        node = tree
+        for name in path[:-1]:
+            node = node.setdefault(name, {})
+        node[path[-1]] = labels[path]
+
+    return node_builder(tree)
+
+
+def dump_rows(schema: type[BaseModel], rows: Sequence[Row]) -> list[dict]:
+    return list(map(row_builder(schema), rows))
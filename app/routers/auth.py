@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException
+from sqlalchemy import func, select
 
 from app.dependencies import db_dep, oauth2_form_dep
 from app.enums import RoleEnum
 from app.models import User
 from app.schemas import TokenResponse, UserRegisterRequest
+from app.services import invalidate_cached_user
 from app.settings import ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_MINUTES
-from app.utils import create_jwt_token, hash_password, verify_password
+from app.utils import create_jwt_token, hash_password, verify_and_update_password
 
 router = APIRouter(
 	prefix="/auth",
@@ -15,44 +17,53 @@ router = APIRouter(
 
 @router.post("/register/")
 async def register_user(db: db_dep, register_data: UserRegisterRequest):
-	is_user_exists = db.query(User).filter(User.email == register_data.email).first()
+	is_user_exists = await db.scalar(
+		select(User).where(User.email == register_data.email)
+	)
 
 	if is_user_exists:
 		raise HTTPException(status_code=400, detail="User already exists")
 
-	is_first_user = db.query(User).count() == 0
+	is_first_user = await db.scalar(select(func.count()).select_from(User)) == 0
 
 	if is_first_user:
 		user = User(
 			email=register_data.email,
-			password=hash_password(register_data.password),
+			password=await hash_password(register_data.password),
 			role=RoleEnum.admin,
 			# is_active=False,  # not confirmed yet
 		)
 	else:
 		user = User(
 			email=register_data.email,
-			password=hash_password(register_data.password),
+			password=await hash_password(register_data.password),
 			role=RoleEnum.user,
 			is_deleted=False,
 		)
 
 	db.add(user)
-	db.commit()
-	db.refresh(user)
+	await db.commit()
 
 	return {"detail": "Registration successful."}
 
 
 @router.post("/login/")
 async def login(form_data: oauth2_form_dep, db: db_dep):
-	user = db.query(User).filter(User.email == form_data.username).first()
+	user = await db.scalar(select(User).where(User.email == form_data.username))
 	if not user:
 		raise HTTPException(status_code=400, detail="Incorrect username or password")
 
-	if not verify_password(form_data.password, user.password):
+	is_valid, new_hash = await verify_and_update_password(
+		form_data.password, user.password
+	)
+	if not is_valid:
 		raise HTTPException(status_code=400, detail="Incorrect username or password")
 
+	if new_hash:
+		user.password = new_hash
+		await db.commit()
+		invalidate_cached_user(user.email)
+
 	access_token = create_jwt_token(
 		{"email": user.email}, expires_delta=ACCESS_TOKEN_EXPIRE_MINUTES
 	)
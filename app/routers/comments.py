@@ -1,15 +1,26 @@
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Response
+from sqlalchemy import select
 
 from app.dependencies import current_user_dep, db_dep
 from app.models import Comment
 from app.schemas import CommentCreateRequest, CommentResponse, CommentUpdateRequest
+from app.services import (
+    audit_writer,
+    fan_out_task_event,
+    load_for_response,
+    response_cache,
+)
 
 router = APIRouter(prefix="/comments", tags=["Comments"])
 
 
 @router.get("/{comment_id}/", response_model=CommentResponse)
 async def detail_comment(current_user: current_user_dep, db: db_dep, comment_id: int):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await db.scalar(
+        select(Comment)
+        .where(Comment.id == comment_id)
+        .options(*CommentResponse.load_options)
+    )
 
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -19,7 +30,10 @@ async def detail_comment(current_user: current_user_dep, db: db_dep, comment_id:
 
 @router.post("/comments/create/", response_model=CommentResponse)
 async def write_comment(
-    current_user: current_user_dep, db: db_dep, data: CommentCreateRequest
+    current_user: current_user_dep,
+    db: db_dep,
+    data: CommentCreateRequest,
+    background_tasks: BackgroundTasks,
 ):
     comment = Comment(
         task_id=data.task_id,
@@ -28,8 +42,18 @@ async def write_comment(
     )
 
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    await db.commit()
+    await response_cache.invalidate(db, f"task:{comment.task_id}:comments")
+
+    audit_writer.record(current_user.id, f"Added comment {comment.id}", comment.task_id)
+
+    comment = await load_for_response(db, Comment, comment.id, CommentResponse)
+    background_tasks.add_task(
+        fan_out_task_event,
+        current_user.id,
+        comment.task_id,
+        f"New comment on {comment.task.key}",
+    )
 
     return comment
 
@@ -41,7 +65,11 @@ async def update_comment(
     comment_id: int,
     data: CommentUpdateRequest,
 ):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await db.scalar(
+        select(Comment)
+        .where(Comment.id == comment_id)
+        .options(*CommentResponse.load_options)
+    )
 
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -54,15 +82,19 @@ async def update_comment(
     for attr, value in data:
         setattr(comment, attr, value)
 
-    db.commit()
-    db.refresh(comment)
+    await db.commit()
+    await response_cache.invalidate(db, f"task:{comment.task_id}:comments")
+
+    audit_writer.record(
+        current_user.id, f"Edited comment {comment.id}", comment.task_id
+    )
 
     return comment
 
 
 @router.delete("/comments/{comment_id}/delete/")
 async def delete_comment(current_user: current_user_dep, db: db_dep, comment_id: int):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await db.get(Comment, comment_id)
 
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -72,7 +104,12 @@ async def delete_comment(current_user: current_user_dep, db: db_dep, comment_id:
             status_code=403, detail="You can only delete your own comments"
         )
 
-    db.delete(comment)
-    db.commit()
+    await db.delete(comment)
+    await db.commit()
+    await response_cache.invalidate(db, f"task:{comment.task_id}:comments")
+
+    audit_writer.record(
+        current_user.id, f"Deleted comment {comment.id}", comment.task_id
+    )
 
     return Response(status_code=204)
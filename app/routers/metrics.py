@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+
+from app.database import get_pool_stats
+from app.dependencies import admin_user_dep
+from app.schemas import (
+    AuditWriterStatsResponse,
+    DBPoolStatsResponse,
+    NotificationBrokerStatsResponse,
+    PasswordHasherStatsResponse,
+    ResponseCacheStatsResponse,
+)
+from app.services import audit_writer, notification_broker, response_cache
+from app.settings import PASSWORD_HASHER_WORKERS
+from app.utils import password_hasher_stats
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/db-pool/", response_model=DBPoolStatsResponse)
+async def get_db_pool_metrics(admin_user: admin_user_dep):
+    return get_pool_stats()
+
+
+@router.get("/password-hasher/", response_model=PasswordHasherStatsResponse)
+async def get_password_hasher_metrics(admin_user: admin_user_dep):
+    return {"workers": PASSWORD_HASHER_WORKERS, **password_hasher_stats}
+
+
+@router.get("/audit-writer/", response_model=AuditWriterStatsResponse)
+async def get_audit_writer_metrics(admin_user: admin_user_dep):
+    return audit_writer.stats()
+
+
+@router.get("/notification-broker/", response_model=NotificationBrokerStatsResponse)
+async def get_notification_broker_metrics(admin_user: admin_user_dep):
+    return notification_broker.stats()
+
+
+@router.get("/response-cache/", response_model=ResponseCacheStatsResponse)
+async def get_response_cache_metrics(admin_user: admin_user_dep):
+    return response_cache.stats()
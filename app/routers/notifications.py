@@ -1,33 +1,107 @@
-from fastapi import APIRouter, HTTPException
+from typing import Annotated
 
-from app.dependencies import current_user_dep, db_dep
-from app.models import Notification
-from app.schemas import NotificationResponse
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.dependencies import current_user_dep, db_dep, page_dep
+from app.models import Notification, User
+from app.schemas import (
+	CursorPage,
+	NotificationReadRequest,
+	NotificationReadResponse,
+	NotificationResponse,
+	NotificationUnreadCountResponse,
+)
+from app.services import (
+	mark_notifications_read,
+	paginate,
+	sse_events,
+	too_many_items,
+)
+from app.settings import BULK_MAX_ITEMS
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
-@router.get("/notifications/", response_model=list[NotificationResponse])
-async def get_notifications(current_user: current_user_dep, db: db_dep):
-	notifications = current_user.received_notifications.all()
+@router.get("/notifications/", response_model=CursorPage[NotificationResponse])
+async def get_notifications(current_user: current_user_dep, db: db_dep, page: page_dep):
+	stmt = (
+		select(Notification)
+		.where(Notification.recipient_id == current_user.id)
+		.options(*NotificationResponse.load_options)
+	)
+
+	return await paginate(
+		db, stmt, page, Notification.created_at, Notification.id, descending=True
+	)
+
+
+@router.get("/unread-count/", response_model=NotificationUnreadCountResponse)
+async def get_unread_count(current_user: current_user_dep, db: db_dep):
+	# Read fresh: current_user may come from the user cache.
+	unread = await db.scalar(
+		select(User.unread_notifications).where(User.id == current_user.id)
+	)
+
+	return {"unread": unread}
+
+
+@router.post("/read-all/", response_model=NotificationReadResponse)
+async def read_all_notifications(current_user: current_user_dep, db: db_dep):
+	marked, unread = await mark_notifications_read(db, current_user.id)
+
+	await db.commit()
+
+	return {"marked": marked, "unread": unread}
 
-	return notifications
+
+@router.post("/read/", response_model=NotificationReadResponse)
+async def read_notifications(
+		current_user: current_user_dep, db: db_dep, data: NotificationReadRequest
+):
+	if len(data.ids) > BULK_MAX_ITEMS:
+		raise too_many_items()
+
+	# Ids of other users' notifications are ignored by the recipient filter.
+	marked, unread = await mark_notifications_read(db, current_user.id, data.ids)
+
+	await db.commit()
+
+	return {"marked": marked, "unread": unread}
+
+
+@router.get("/stream/", response_class=StreamingResponse)
+async def stream_notifications(
+		current_user: current_user_dep,
+		last_event_id: Annotated[int | None, Header()] = None,
+):
+	# Replaces polling the list: new notifications are pushed as they are
+	# created. After a "reset" event the client reloads the list.
+	return StreamingResponse(
+		sse_events(current_user.id, last_event_id),
+		media_type="text/event-stream",
+		headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+	)
 
 
 @router.put("/notifications/{notification_id}/", response_model=NotificationResponse)
 async def read_notification(
 		current_user: current_user_dep, db: db_dep, notification_id: int
 ):
-	notification = (
-		db.query(Notification).filter(Notification.id == notification_id).first()
+	await mark_notifications_read(db, current_user.id, [notification_id])
+	await db.commit()
+
+	notification = await db.scalar(
+		select(Notification)
+		.where(
+			Notification.id == notification_id,
+			Notification.recipient_id == current_user.id,
+		)
+		.options(*NotificationResponse.load_options)
 	)
 
 	if not notification:
 		raise HTTPException(status_code=404, detail="Notification not found")
 
-	notification.is_read = True
-
-	db.commit()
-	db.refresh(notification)
-
 	return notification
@@ -1,34 +1,58 @@
-from fastapi import APIRouter, HTTPException
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from sqlalchemy import select
 
 from app.dependencies import (
 	admin_user_dep,
 	current_user_dep,
 	db_dep,
 	management_user_dep,
+	page_dep,
 )
-from app.models import Project, User
+from app.enums import ExportFormatEnum
+from app.models import Project, ProjectMember, Task, User
+from app.responses import FastJSONResponse, model_response
 from app.schemas import (
+	CursorPage,
+	ProjectAnalyticsResponse,
 	ProjectCreateRequest,
 	ProjectInviteRequest,
 	ProjectKickRequest,
 	ProjectMemberResponse,
 	ProjectResponse,
 	ProjectUpdateRequest,
+	TaskBoardResponse,
 	TaskListResponse,
 )
-from app.services import generate_project_key
+from app.services import (
+	allocate_project_key,
+	audit_writer,
+	board_etag,
+	etag_matches,
+	export_response,
+	load_board,
+	not_modified,
+	paginate,
+	paginate_rows,
+	project_analytics,
+	project_members_etag,
+	project_tasks_etag,
+	response_cache,
+	task_export_query,
+)
+from app.settings import ANALYTICS_MAX_DAYS, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
 
-@router.get("/all/", response_model=list[ProjectResponse])
-async def get_all_projects(admin_user: admin_user_dep, db: db_dep):
-	projects = db.query(Project).all()
-
-	if not projects:
-		raise HTTPException(status_code=404, detail="No projects found")
+@router.get("/all/", response_model=CursorPage[ProjectResponse])
+async def get_all_projects(admin_user: admin_user_dep, db: db_dep, page: page_dep):
+	stmt = select(*ProjectResponse.row_columns).join(Project.owner)
 
-	return projects
+	return FastJSONResponse(
+		await paginate_rows(db, stmt, page, ProjectResponse, Project.id)
+	)
 
 
 @router.get("/joined/")
@@ -37,32 +61,43 @@ async def get_joined_projects(current_user: current_user_dep, db: db_dep):
 
 
 @router.get("/{project_key}/", response_model=ProjectResponse)
-async def get_project_by_id(db: db_dep, project_id: int):
-	project = db.query(Project).filter(Project.id == project_id).first()
+async def get_project_by_id(db: db_dep, project_id: int, request: Request):
+	cache_key = response_cache.key(request)
+
+	if cached := response_cache.get(cache_key, request):
+		return cached
+
+	project = await db.scalar(
+		select(Project)
+		.where(Project.id == project_id)
+		.options(*ProjectResponse.load_options)
+	)
 
 	if not project:
 		raise HTTPException(status_code=404, detail="Project not found")
 
-	return project
+	return response_cache.store(
+		cache_key,
+		model_response(ProjectResponse, project),
+		[f"project:{project.id}", f"user:{project.owner_id}"],
+	)
 
 
 @router.post("/create/")
 async def create_project(
 		user: management_user_dep, db: db_dep, data: ProjectCreateRequest
 ):
-	generated_key = generate_project_key(db=db, name=data.name)
-
 	project = Project(
 		name=data.name,
-		key=generated_key,
 		description=data.description,
 		is_private=data.is_private,
 		owner_id=user.id,
 	)
 
 	db.add(project)
-	db.commit()
-	db.refresh(project)
+	await allocate_project_key(db=db, project=project, name=data.name)
+	await db.commit()
+	await db.refresh(project)
 
 	return project
 
@@ -71,7 +106,7 @@ async def create_project(
 async def update_project(
 		user: management_user_dep, db: db_dep, project_key: str, data: ProjectUpdateRequest
 ):
-	project = db.query(Project).filter(Project.key == project_key).first()
+	project = await db.scalar(select(Project).where(Project.key == project_key))
 
 	if not project:
 		raise HTTPException(status_code=404, detail="Project not found")
@@ -79,11 +114,12 @@ async def update_project(
 	for attr, value in data:
 		setattr(project, attr, value)
 
-	if "name" in data:
-		project.key = generate_project_key(db=db, name=data.name)
+	if data.name:
+		await allocate_project_key(db=db, project=project, name=data.name)
 
-	db.commit()
-	db.refresh(project)
+	await db.commit()
+	await response_cache.invalidate(db, f"project:{project.id}")
+	await db.refresh(project)
 
 	return project
 
@@ -91,81 +127,241 @@ async def update_project(
 ### Members
 
 
-@router.get("/{project_key}/members/", response_model=list[ProjectMemberResponse])
-async def get_project_members(user: current_user_dep, db: db_dep, project_key: str):
-	project = db.query(Project).filter(Project.key == project_key).first()
+@router.get(
+	"/{project_key}/members/", response_model=CursorPage[ProjectMemberResponse]
+)
+async def get_project_members(
+		user: current_user_dep,
+		db: db_dep,
+		project_key: str,
+		page: page_dep,
+		request: Request,
+):
+	cache_key = response_cache.key(request)
+
+	if cached := response_cache.get(cache_key, request):
+		return cached
+
+	project = await db.scalar(select(Project).where(Project.key == project_key))
 
 	if not project:
 		raise HTTPException(status_code=404, detail="Project not found")
 
-	members = project.members.all()
+	etag = await project_members_etag(db, project, page)
 
-	return members
+	if etag_matches(request, etag):
+		return not_modified(etag)
+
+	stmt = (
+		select(ProjectMember)
+		.where(ProjectMember.project_id == project.id)
+		.options(*ProjectMemberResponse.load_options)
+	)
+	members = await paginate(db, stmt, page, ProjectMember.id)
+
+	return response_cache.store(
+		cache_key,
+		model_response(
+			CursorPage[ProjectMemberResponse], members, headers={"ETag": etag}
+		),
+		[
+			f"project:{project.id}:members",
+			*(f"user:{member.user_id}" for member in members["items"]),
+		],
+	)
 
 
 @router.post("/{project_key}/members/invite/")
 async def invite_project_member(
-		user: management_user_dep,
+		current_user: management_user_dep,
 		db: db_dep,
 		project_key: str,
 		invite_data: ProjectInviteRequest,
 ):
-	project = db.query(Project).filter(Project.key == project_key).first()
+	project = await db.scalar(select(Project).where(Project.key == project_key))
 
 	if not project:
 		raise HTTPException(status_code=404, detail="Project not found")
 
-	user = db.query(User).filter(User.id == invite_data.user_id).first()
+	user = await db.get(User, invite_data.user_id)
 
 	if not user:
 		raise HTTPException(status_code=404, detail="User not found to invite")
 
-	if user in project.members:
+	membership = await db.scalar(
+		select(ProjectMember).where(
+			ProjectMember.project_id == project.id, ProjectMember.user_id == user.id
+		)
+	)
+
+	if membership:
 		raise HTTPException(status_code=400, detail="User is already in the project")
 
-	project.members.append(user)
-	db.commit()
-	db.refresh(project)
+	db.add(ProjectMember(project_id=project.id, user_id=user.id))
+	await db.commit()
+	await response_cache.invalidate(db, f"project:{project.id}:members")
+
+	audit_writer.record(current_user.id, f"Added user {user.id} to project {project.key}")
+	await db.refresh(project)
 
 	return project
 
 
 @router.post("/{project_key}/members/kick/")
 async def kick_project_member(
-		user: management_user_dep,
+		current_user: management_user_dep,
 		db: db_dep,
 		project_key: str,
 		kick_data: ProjectKickRequest,
 ):
-	project = db.query(Project).filter(Project.key == project_key).first()
+	project = await db.scalar(select(Project).where(Project.key == project_key))
 
 	if not project:
 		raise HTTPException(status_code=404, detail="Project not found")
 
-	user = db.query(User).filter(User.id == kick_data.user_id).first()
+	user = await db.get(User, kick_data.user_id)
 
 	if not user:
 		raise HTTPException(status_code=404, detail="User not found to kick")
 
-	if user not in project.members:
+	membership = await db.scalar(
+		select(ProjectMember).where(
+			ProjectMember.project_id == project.id, ProjectMember.user_id == user.id
+		)
+	)
+
+	if not membership:
 		raise HTTPException(status_code=400, detail="User is not in the project")
 
-	project.members.remove(user)
-	db.commit()
-	db.refresh(project)
+	await db.delete(membership)
+	await db.commit()
+	await response_cache.invalidate(db, f"project:{project.id}:members")
+
+	audit_writer.record(
+		current_user.id, f"Removed user {user.id} from project {project.key}"
+	)
+	await db.refresh(project)
 
 	return project
 
 
-@router.get("/{project_key}/tasks/", response_model=list[TaskListResponse])
+@router.get("/{project_key}/tasks/", response_model=CursorPage[TaskListResponse])
 async def get_project_tasks(
-		current_user: current_user_dep, db: db_dep, project_key: str
+		current_user: current_user_dep,
+		db: db_dep,
+		project_key: str,
+		page: page_dep,
+		request: Request,
 ):
-	project = db.query(Project).filter(Project.key == project_key).first()
+	cache_key = response_cache.key(request)
+
+	if cached := response_cache.get(cache_key, request):
+		return cached
+
+	project = await db.scalar(select(Project).where(Project.key == project_key))
 
 	if not project:
 		raise HTTPException(status_code=404, detail="Project not found")
 
-	tasks = project.tasks.all()
+	etag = await project_tasks_etag(db, project, page)
+
+	if etag_matches(request, etag):
+		return not_modified(etag)
+
+	stmt = (
+		select(*TaskListResponse.row_columns)
+		.select_from(Task)
+		.join(Task.project)
+		.join(Task.status)
+		.where(Task.project_id == project.id)
+	)
+
+	return response_cache.store(
+		cache_key,
+		FastJSONResponse(
+			await paginate_rows(db, stmt, page, TaskListResponse, Task.id),
+			headers={"ETag": etag},
+		),
+		[f"project:{project.id}", f"project:{project.id}:tasks"],
+	)
+
 
-	return tasks
+@router.get("/{project_key}/board/", response_model=TaskBoardResponse)
+async def get_project_board(
+		current_user: current_user_dep,
+		db: db_dep,
+		project_key: str,
+		request: Request,
+		limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+):
+	cache_key = response_cache.key(request)
+
+	if cached := response_cache.get(cache_key, request):
+		return cached
+
+	project = await db.scalar(select(Project).where(Project.key == project_key))
+
+	if not project:
+		raise HTTPException(status_code=404, detail="Project not found")
+
+	etag = await board_etag(db, project, limit)
+
+	if etag_matches(request, etag):
+		return not_modified(etag)
+
+	board = await load_board(db, project, limit)
+	assignee_ids = {
+		card["assignee"]["id"] for column in board["columns"] for card in column["tasks"]
+	}
+
+	return response_cache.store(
+		cache_key,
+		FastJSONResponse(board, headers={"ETag": etag}),
+		[
+			f"project:{project.id}",
+			f"project:{project.id}:tasks",
+			*(f"user:{user_id}" for user_id in assignee_ids),
+		],
+	)
+
+
+@router.get("/{project_key}/analytics/", response_model=ProjectAnalyticsResponse)
+async def get_project_analytics(
+		current_user: current_user_dep,
+		db: db_dep,
+		project_key: str,
+		request: Request,
+		days: Annotated[int, Query(ge=1, le=ANALYTICS_MAX_DAYS)] = 365,
+):
+	cache_key = response_cache.key(request)
+
+	if cached := response_cache.get(cache_key, request):
+		return cached
+
+	project = await db.scalar(select(Project).where(Project.key == project_key))
+
+	if not project:
+		raise HTTPException(status_code=404, detail="Project not found")
+
+	return response_cache.store(
+		cache_key,
+		FastJSONResponse(await project_analytics(db, project, days)),
+		[f"project:{project.id}:tasks"],
+	)
+
+
+@router.get("/{project_key}/tasks/export/")
+async def export_project_tasks(
+		current_user: current_user_dep,
+		db: db_dep,
+		project_key: str,
+		export_format: Annotated[ExportFormatEnum, Query(alias="format")] = ExportFormatEnum.ndjson,
+):
+	project = await db.scalar(select(Project).where(Project.key == project_key))
+
+	if not project:
+		raise HTTPException(status_code=404, detail="Project not found")
+
+	return export_response(
+		task_export_query(project.id), export_format, f"{project.key}-tasks"
+	)
@@ -1,46 +1,189 @@
-from fastapi import APIRouter, HTTPException, Response
+from typing import Annotated
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request, Response
+from sqlalchemy import select
 
 from app.dependencies import (
     admin_user_dep,
     current_user_dep,
     db_dep,
+    page_dep,
     task_creatable_user_dep,
 )
-from app.models import Project, Status, Task
+from app.models import Comment, Project, Status, Task
+from app.responses import FastJSONResponse, model_response
 from app.schemas import (
+    CommentResponse,
+    CursorPage,
+    TaskBulkCreateResponse,
+    TaskBulkUpdateItem,
+    TaskBulkUpdateResponse,
     TaskCreateRequest,
     TaskDetailResponse,
     TaskListResponse,
     TaskMoveRequest,
+    TaskSearchResponse,
     TaskUpdateRequest,
 )
-from app.services import generate_task_key
+from app.services import (
+    audit_writer,
+    bulk_create_tasks,
+    bulk_update_tasks,
+    discard_unread,
+    etag_matches,
+    fan_out_task_event,
+    generate_task_key,
+    load_for_response,
+    not_modified,
+    paginate,
+    paginate_rows,
+    read_bulk_items,
+    record_status_changes,
+    response_cache,
+    search_tasks,
+    task_etag,
+)
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 
-@router.get("/all/", response_model=list[TaskListResponse])
-async def get_tasks(admin_user: admin_user_dep, db: db_dep):
-    tasks = db.query(Task).all()
+@router.get("/all/", response_model=CursorPage[TaskListResponse])
+async def get_tasks(admin_user: admin_user_dep, db: db_dep, page: page_dep):
+    stmt = (
+        select(*TaskListResponse.row_columns)
+        .select_from(Task)
+        .join(Task.project)
+        .join(Task.status)
+    )
+
+    return FastJSONResponse(
+        await paginate_rows(db, stmt, page, TaskListResponse, Task.id)
+    )
+
+
+@router.post("/bulk/", response_model=TaskBulkCreateResponse)
+async def bulk_create(
+    current_user: task_creatable_user_dep,
+    db: db_dep,
+    request: Request,
+    background_tasks: BackgroundTasks,
+):
+    items, errors = await read_bulk_items(request, TaskCreateRequest)
+    created = []
+
+    if items:
+        created, invalid = await bulk_create_tasks(db, items, current_user.id)
+        errors += invalid
+
+        await db.commit()
+        await response_cache.invalidate(
+            db, *{f"project:{item.project_id}:tasks" for _, item in items}
+        )
+
+        for item in created:
+            audit_writer.record(
+                current_user.id, f"Created task {item['key']}", item["id"]
+            )
+            background_tasks.add_task(
+                fan_out_task_event,
+                current_user.id,
+                item["id"],
+                f"You were assigned to {item['key']}",
+                include_members=False,
+            )
+
+    return {"created": created, "errors": sorted(errors, key=lambda e: e["index"])}
+
+
+@router.patch("/bulk/", response_model=TaskBulkUpdateResponse)
+async def bulk_update(
+    current_user: task_creatable_user_dep,
+    db: db_dep,
+    request: Request,
+    background_tasks: BackgroundTasks,
+):
+    items, errors = await read_bulk_items(request, TaskBulkUpdateItem)
+    updated = []
+
+    if items:
+        updated, invalid, reassigned = await bulk_update_tasks(
+            db, items, current_user.id
+        )
+        errors += invalid
+
+        await db.commit()
+
+        project_ids = await db.scalars(
+            select(Task.project_id).where(Task.id.in_(updated)).distinct()
+        )
+        await response_cache.invalidate(
+            db, *(f"project:{project_id}:tasks" for project_id in project_ids)
+        )
+
+        for task_id in updated:
+            audit_writer.record(current_user.id, "Updated task", task_id)
+
+        for task_id, key in reassigned:
+            background_tasks.add_task(
+                fan_out_task_event,
+                current_user.id,
+                task_id,
+                f"You were assigned to {key}",
+                include_members=False,
+            )
+
+    return {"updated": updated, "errors": sorted(errors, key=lambda e: e["index"])}
+
+
+@router.get("/search/", response_model=CursorPage[TaskSearchResponse])
+async def search(
+    current_user: current_user_dep,
+    db: db_dep,
+    page: page_dep,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    project: str | None = None,
+):
+    return await search_tasks(db, current_user, q, project, page)
+
+
+@router.get("/{task_key}/", response_model=TaskDetailResponse)
+async def get_task_by_key(
+    current_user: current_user_dep,
+    db: db_dep,
+    task_key: str,
+    request: Request,
+    response: Response,
+):
+    etag = await task_etag(db, task_key)
 
-    return tasks
+    if not etag:
+        raise HTTPException(status_code=404, detail="Task not found")
 
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-@router.get("/{task_key}/")
-async def get_task_by_key(current_user: current_user_dep, db: db_dep, task_key: str):
-    task = db.query(Task).filter(Task.key == task_key).first()
+    task = await db.scalar(
+        select(Task)
+        .where(Task.key == task_key)
+        .options(*TaskDetailResponse.load_options)
+    )
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
+    response.headers["ETag"] = etag
+
     return task
 
 
 @router.post("/create/", response_model=TaskDetailResponse)
 async def create_task(
-    current_user: task_creatable_user_dep, db: db_dep, data: TaskCreateRequest
+    current_user: task_creatable_user_dep,
+    db: db_dep,
+    data: TaskCreateRequest,
+    background_tasks: BackgroundTasks,
 ):
-    project = db.query(Project).filter(Project.id == data.project_id).first()
+    project = await db.get(Project, data.project_id)
 
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -49,7 +192,7 @@ async def create_task(
         project_id=data.project_id,
         summary=data.summary,
         description=data.description,
-        key=generate_task_key(db=db, project=project),
+        key=await generate_task_key(db=db, project=project),
         status_id=data.status_id,
         priority=data.priority,
         reporter_id=current_user.id,
@@ -58,10 +201,20 @@ async def create_task(
     )
 
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await record_status_changes(db, [(task.project_id, None, task.status_id, None)])
+    await db.commit()
+    await response_cache.invalidate(db, f"project:{task.project_id}:tasks")
+
+    audit_writer.record(current_user.id, f"Created task {task.key}", task.id)
+    background_tasks.add_task(
+        fan_out_task_event,
+        current_user.id,
+        task.id,
+        f"You were assigned to {task.key}",
+        include_members=False,
+    )
 
-    return task
+    return await load_for_response(db, Task, task.id, TaskDetailResponse)
 
 
 @router.put("/{task_id}/update/", response_model=TaskDetailResponse)
@@ -70,8 +223,11 @@ async def update_task(
     db: db_dep,
     task_id: int,
     data: TaskUpdateRequest,
+    background_tasks: BackgroundTasks,
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    # Locked until commit, so that concurrent changes book their status moves
+    # one after the other, each from the status the previous one left.
+    task = await db.get(Task, task_id, with_for_update=True)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -81,40 +237,78 @@ async def update_task(
             status_code=403, detail="You don't have permission to update this task"
         )
 
+    previous_assignee_id = task.assignee_id
+    previous_status_id = task.status_id
+
     for attr, value in data:
         setattr(task, attr, value)
 
-    db.commit()
-    db.refresh(task)
+    await record_status_changes(
+        db, [(task.project_id, previous_status_id, task.status_id, task.created_at)]
+    )
+    await db.commit()
+    await response_cache.invalidate(db, f"project:{task.project_id}:tasks")
+
+    audit_writer.record(current_user.id, f"Updated task {task.key}", task.id)
+
+    if task.assignee_id != previous_assignee_id:
+        background_tasks.add_task(
+            fan_out_task_event,
+            current_user.id,
+            task.id,
+            f"You were assigned to {task.key}",
+            include_members=False,
+        )
 
-    return task
+    return await load_for_response(db, Task, task.id, TaskDetailResponse)
 
 
 @router.patch("/{task_id}/move/", response_model=TaskDetailResponse)
 async def move_task(
-    current_user: current_user_dep, db: db_dep, task_id: int, status_id: TaskMoveRequest
+    current_user: current_user_dep,
+    db: db_dep,
+    task_id: int,
+    data: TaskMoveRequest,
+    background_tasks: BackgroundTasks,
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    # Locked until commit, so that concurrent changes book their status moves
+    # one after the other, each from the status the previous one left.
+    task = await db.get(Task, task_id, with_for_update=True)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    status = db.query(Status).filter(Status.id == status_id).first()
+    status = await db.get(Status, data.status_id)
 
     if not status:
         raise HTTPException(status_code=404, detail="Status not found")
 
-    task.status_id = status_id
+    await record_status_changes(
+        db, [(task.project_id, task.status_id, data.status_id, task.created_at)]
+    )
+    task.status_id = data.status_id
 
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await response_cache.invalidate(db, f"project:{task.project_id}:tasks")
 
-    return task
+    audit_writer.record(
+        current_user.id, f"Moved task {task.key} to {status.name}", task.id
+    )
+    background_tasks.add_task(
+        fan_out_task_event,
+        current_user.id,
+        task.id,
+        f"{task.key} was moved to {status.name}",
+    )
+
+    return await load_for_response(db, Task, task.id, TaskDetailResponse)
 
 
 @router.delete("/{task_id}/delete/")
 async def delete_task(current_user: task_creatable_user_dep, db: db_dep, task_id: int):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    # Locked until commit, so that concurrent changes book their status moves
+    # one after the other, each from the status the previous one left.
+    task = await db.get(Task, task_id, with_for_update=True)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -124,19 +318,50 @@ async def delete_task(current_user: task_creatable_user_dep, db: db_dep, task_id
             status_code=403, detail="You don't have permission to delete this task"
         )
 
-    db.delete(task)
-    db.commit()
+    await discard_unread(db, task.id)
+    await db.delete(task)
+    await record_status_changes(db, [(task.project_id, task.status_id, None, None)])
+    await db.commit()
+    await response_cache.invalidate(
+        db, f"project:{task.project_id}:tasks", f"task:{task.id}:comments"
+    )
+
+    audit_writer.record(current_user.id, f"Deleted task {task.key}")
 
     return Response(status_code=204)
 
 
-@router.get("/{task_key}/comments/")
-async def get_task_comments(current_user: current_user_dep, db: db_dep, task_key: str):
-    task = db.query(Task).filter(Task.key == task_key).first()
+@router.get("/{task_key}/comments/", response_model=CursorPage[CommentResponse])
+async def get_task_comments(
+    current_user: current_user_dep,
+    db: db_dep,
+    task_key: str,
+    page: page_dep,
+    request: Request,
+):
+    cache_key = response_cache.key(request)
+
+    if cached := response_cache.get(cache_key, request):
+        return cached
+
+    task = await db.scalar(select(Task).where(Task.key == task_key))
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    comments = task.comments.all()
+    stmt = (
+        select(Comment)
+        .where(Comment.task_id == task.id)
+        .options(*CommentResponse.load_options)
+    )
+
+    comments = await paginate(db, stmt, page, Comment.id)
 
-    return comments
+    return response_cache.store(
+        cache_key,
+        model_response(CursorPage[CommentResponse], comments),
+        [
+            f"task:{task.id}:comments",
+            *(f"user:{comment.user_id}" for comment in comments["items"]),
+        ],
+    )
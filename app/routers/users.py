@@ -3,14 +3,19 @@ from fastapi import APIRouter, HTTPException, UploadFile
 from app.dependencies import current_user_dep, db_dep
 from app.models import User
 from app.schemas import ProfileResponse, ProfileUpdateRequest
-from app.services import save_avatar_file, validate_image
+from app.services import (
+    invalidate_cached_user,
+    response_cache,
+    save_avatar_file,
+    validate_image,
+)
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/users/{id}/", response_model=ProfileResponse)
 async def get_user_by_id(db: db_dep, id: int):
-    user = db.query(User).filter(User.id == id).first()
+    user = await db.get(User, id)
 
     if not user or (user.is_deleted):
         raise HTTPException(status_code=404, detail="User not found")
@@ -29,8 +34,9 @@ async def update_profile(
 ):
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(current_user, field, value)
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    invalidate_cached_user(current_user.email)
+    await response_cache.invalidate(db, f"user:{current_user.id}")
 
     return current_user
 
@@ -52,7 +58,9 @@ async def delete_profile(db: db_dep, current_user: current_user_dep):
     current_user.is_deleted = True
     current_user.is_active = False
 
-    db.commit()
+    await db.commit()
+    invalidate_cached_user(current_user.email)
+    await response_cache.invalidate(db, f"user:{current_user.id}")
 
     return {
         "detail": "Profile deleted successfully",
@@ -1,7 +1,21 @@
 from .auth import TokenResponse, UserRegisterRequest
 from .comments import CommentCreateRequest, CommentResponse, CommentUpdateRequest
-from .notifications import NotificationResponse
+from .metrics import (
+    AuditWriterStatsResponse,
+    DBPoolStatsResponse,
+    NotificationBrokerStatsResponse,
+    PasswordHasherStatsResponse,
+    ResponseCacheStatsResponse,
+)
+from .notifications import (
+    NotificationReadRequest,
+    NotificationReadResponse,
+    NotificationResponse,
+    NotificationUnreadCountResponse,
+)
+from .pagination import CursorPage, PageParams
 from .projects import (
+    ProjectAnalyticsResponse,
     ProjectCreateRequest,
     ProjectInviteRequest,
     ProjectKickRequest,
@@ -10,31 +24,58 @@ from .projects import (
     ProjectUpdateRequest,
 )
 from .tasks import (
+    TaskBoardCardNested,
+    TaskBoardResponse,
+    TaskBulkCreatedItem,
+    TaskBulkCreateResponse,
+    TaskBulkError,
+    TaskBulkUpdateItem,
+    TaskBulkUpdateResponse,
     TaskCreateRequest,
     TaskDetailResponse,
     TaskListResponse,
     TaskMoveRequest,
+    TaskSearchResponse,
     TaskUpdateRequest,
 )
 from .users import ProfileResponse, ProfileUpdateRequest
 
 __all__ = [
+    "AuditWriterStatsResponse",
     "CommentCreateRequest",
     "CommentResponse",
     "CommentUpdateRequest",
+    "CursorPage",
+    "DBPoolStatsResponse",
+    "NotificationBrokerStatsResponse",
+    "NotificationReadRequest",
+    "NotificationReadResponse",
     "NotificationResponse",
+    "NotificationUnreadCountResponse",
+    "PageParams",
+    "PasswordHasherStatsResponse",
     "ProfileResponse",
     "ProfileUpdateRequest",
+    "ProjectAnalyticsResponse",
     "ProjectCreateRequest",
     "ProjectInviteRequest",
     "ProjectKickRequest",
     "ProjectMemberResponse",
     "ProjectResponse",
     "ProjectUpdateRequest",
+    "ResponseCacheStatsResponse",
+    "TaskBoardCardNested",
+    "TaskBoardResponse",
+    "TaskBulkCreateResponse",
+    "TaskBulkCreatedItem",
+    "TaskBulkError",
+    "TaskBulkUpdateItem",
+    "TaskBulkUpdateResponse",
     "TaskCreateRequest",
     "TaskDetailResponse",
     "TaskListResponse",
     "TaskMoveRequest",
+    "TaskSearchResponse",
     "TaskUpdateRequest",
     "TokenResponse",
     "UserRegisterRequest",
@@ -1,4 +1,9 @@
+from typing import ClassVar
+
 from pydantic import BaseModel
+from sqlalchemy.orm import joinedload
+
+from app.models import Comment
 
 
 class CommentUserNested(BaseModel):
@@ -17,6 +22,11 @@ class CommentResponse(BaseModel):
     task: CommentTaskNested
     content: str
 
+    load_options: ClassVar[tuple] = (
+        joinedload(Comment.user, innerjoin=True),
+        joinedload(Comment.task, innerjoin=True),
+    )
+
 
 class CommentCreateRequest(BaseModel):
     task_id: int
@@ -0,0 +1,52 @@
+from pydantic import BaseModel
+
+
+class DBPoolStatsResponse(BaseModel):
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    checkout_timeouts: int
+    wait_time_avg_ms: float
+    wait_time_max_ms: float
+
+
+class AuditWriterStatsResponse(BaseModel):
+    queue_depth: int
+    queue_max: int
+    enqueued: int
+    written: int
+    dropped: int
+    failed: int
+    batches: int
+    flush_time_avg_ms: float
+    flush_time_max_ms: float
+
+
+class NotificationBrokerStatsResponse(BaseModel):
+    backend: str
+    users: int
+    connections: int
+    delivered: int
+    overflowed: int
+
+
+class ResponseCacheStatsResponse(BaseModel):
+    backend: str
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    stale: int
+    stored: int
+    invalidations: int
+
+
+class PasswordHasherStatsResponse(BaseModel):
+    workers: int
+    queued: int
+    running: int
+    completed: int
+    rejected: int
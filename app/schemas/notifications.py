@@ -1,4 +1,9 @@
+from typing import ClassVar
+
 from pydantic import BaseModel
+from sqlalchemy.orm import joinedload
+
+from app.models import Notification
 
 
 class NotificationUserNested(BaseModel):
@@ -15,6 +20,19 @@ class NotificationProjectNested(BaseModel):
     key: str
 
 
+class NotificationUnreadCountResponse(BaseModel):
+    unread: int
+
+
+class NotificationReadRequest(BaseModel):
+    ids: list[int]
+
+
+class NotificationReadResponse(BaseModel):
+    marked: int
+    unread: int
+
+
 class NotificationResponse(BaseModel):
     id: int
     message: str
@@ -22,3 +40,10 @@ class NotificationResponse(BaseModel):
     sender: NotificationUserNested
     task: NotificationTaskNested | None
     project: NotificationProjectNested | None
+
+    load_options: ClassVar[tuple] = (
+        joinedload(Notification.recipient, innerjoin=True),
+        joinedload(Notification.sender, innerjoin=True),
+        joinedload(Notification.task),
+        joinedload(Notification.project),
+    )
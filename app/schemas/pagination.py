@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class PageParams(BaseModel):
+    cursor: str | None = None
+    limit: int
+
+
+class CursorPage[T](BaseModel):
+    items: list[T]
+    next_cursor: str | None = None
@@ -1,6 +1,11 @@
+from datetime import date, datetime
+from typing import ClassVar
+
 from pydantic import BaseModel
+from sqlalchemy.orm import joinedload
 
 from app.enums import RoleEnum
+from app.models import Project, ProjectMember, User
 
 
 class ProjectOwnerNested(BaseModel):
@@ -17,6 +22,19 @@ class ProjectResponse(BaseModel):
     description: str | None = None
     owner: ProjectOwnerNested
 
+    load_options: ClassVar[tuple] = (joinedload(Project.owner, innerjoin=True),)
+    # For the row fast path; each label is the field the column fills.
+    row_columns: ClassVar[tuple] = (
+        Project.id.label("id"),
+        Project.name.label("name"),
+        Project.key.label("key"),
+        Project.description.label("description"),
+        User.id.label("owner.id"),
+        User.email.label("owner.email"),
+        User.fullname.label("owner.fullname"),
+        User.avatar.label("owner.avatar"),
+    )
+
     model_config = {
         "from_attributes": True,
         "json_schema_extra": {
@@ -59,4 +77,14 @@ class ProjectKickRequest(BaseModel):
 class ProjectMemberResponse(BaseModel):
     id: int
     user: ProjectOwnerNested
-    joined_at: str
+    joined_at: datetime
+
+    load_options: ClassVar[tuple] = (joinedload(ProjectMember.user, innerjoin=True),)
+
+
+class ProjectAnalyticsResponse(BaseModel):
+    start: date
+    end: date
+    remaining: list[int]
+    completed: list[int]
+    cycle_time_hours: list[float | None]
@@ -1,4 +1,10 @@
+from datetime import datetime
+from typing import ClassVar
+
 from pydantic import BaseModel
+from sqlalchemy.orm import joinedload
+
+from app.models import Project, Status, Task, User
 
 
 class TaskListProjectNested(BaseModel):
@@ -23,6 +29,62 @@ class TaskListResponse(BaseModel):
     status: TaskListStatusNested
     priority: str
 
+    load_options: ClassVar[tuple] = (
+        joinedload(Task.project, innerjoin=True),
+        joinedload(Task.status, innerjoin=True),
+    )
+    # For the row fast path; each label is the field the column fills.
+    row_columns: ClassVar[tuple] = (
+        Task.id.label("id"),
+        Project.key.label("project.key"),
+        Task.key.label("key"),
+        Task.summary.label("summary"),
+        Status.name.label("status.name"),
+        Task.priority.label("priority"),
+    )
+
+
+class TaskSearchResponse(BaseModel):
+    task: TaskListResponse
+    rank: float
+    snippet: str
+
+
+class TaskBoardCardNested(BaseModel):
+    id: int
+    key: str
+    summary: str
+    priority: str
+    due_date: datetime | None
+    assignee: TaskListUserNested
+
+    row_columns: ClassVar[tuple] = (
+        Task.id.label("id"),
+        Task.key.label("key"),
+        Task.summary.label("summary"),
+        Task.priority.label("priority"),
+        Task.due_date.label("due_date"),
+        User.id.label("assignee.id"),
+        User.email.label("assignee.email"),
+        User.fullname.label("assignee.fullname"),
+    )
+
+
+class TaskBoardStatusNested(BaseModel):
+    id: int
+    name: str
+
+
+class TaskBoardColumnNested(BaseModel):
+    status: TaskBoardStatusNested
+    count: int
+    tasks: list[TaskBoardCardNested]
+
+
+class TaskBoardResponse(BaseModel):
+    project: TaskListProjectNested
+    columns: list[TaskBoardColumnNested]
+
 
 class TaskDetailResponse(BaseModel):
     id: int
@@ -34,7 +96,14 @@ class TaskDetailResponse(BaseModel):
     priority: str
     assignee: TaskListUserNested
     reporter: TaskListUserNested
-    due_date: str
+    due_date: datetime | None
+
+    load_options: ClassVar[tuple] = (
+        joinedload(Task.project, innerjoin=True),
+        joinedload(Task.status, innerjoin=True),
+        joinedload(Task.assignee, innerjoin=True),
+        joinedload(Task.reporter, innerjoin=True),
+    )
 
 
 class TaskCreateRequest(BaseModel):
@@ -45,7 +114,7 @@ class TaskCreateRequest(BaseModel):
     priority: str
     assignee_id: int
     reporter_id: int
-    due_date: str
+    due_date: datetime | None
 
 
 class TaskUpdateRequest(BaseModel):
@@ -55,8 +124,36 @@ class TaskUpdateRequest(BaseModel):
     priority: str | None
     assignee_id: int | None
     reporter_id: int | None
-    due_date: str | None
+    due_date: datetime | None
 
 
 class TaskMoveRequest(BaseModel):
     status_id: int
+
+
+class TaskBulkUpdateItem(BaseModel):
+    id: int
+    status_id: int | None = None
+    assignee_id: int | None = None
+    priority: str | None = None
+
+
+class TaskBulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class TaskBulkCreatedItem(BaseModel):
+    index: int
+    id: int
+    key: str
+
+
+class TaskBulkCreateResponse(BaseModel):
+    created: list[TaskBulkCreatedItem]
+    errors: list[TaskBulkError]
+
+
+class TaskBulkUpdateResponse(BaseModel):
+    updated: list[int]
+    errors: list[TaskBulkError]
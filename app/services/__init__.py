@@ -1,10 +1,72 @@
-from .projects import generate_project_key
-from .tasks import generate_task_key
-from .users import save_avatar_file, validate_image
+from .analytics import project_analytics, record_status_changes
+from .audit import audit_writer
+from .board import load_board
+from .broker import notification_broker, sse_events
+from .bulk import read_bulk_items, too_many_items
+from .etags import (
+    board_etag,
+    etag_matches,
+    not_modified,
+    project_members_etag,
+    project_tasks_etag,
+    task_etag,
+)
+from .exports import export_response, task_export_query
+from .loading import load_for_response
+from .notifications import (
+    discard_unread,
+    fan_out_task_event,
+    mark_notifications_read,
+)
+from .pagination import apply_keyset, encode_cursor, paginate, paginate_rows
+from .projects import allocate_project_key
+from .response_cache import response_cache
+from .search import search_tasks
+from .tasks import bulk_create_tasks, bulk_update_tasks, generate_task_key
+from .users import (
+    admin_auth_cache,
+    cache_user,
+    get_cached_user,
+    invalidate_cached_user,
+    save_avatar_file,
+    validate_image,
+)
 
 __all__ = [
-    "generate_project_key",
+    "admin_auth_cache",
+    "allocate_project_key",
+    "apply_keyset",
+    "audit_writer",
+    "board_etag",
+    "bulk_create_tasks",
+    "bulk_update_tasks",
+    "cache_user",
+    "discard_unread",
+    "encode_cursor",
+    "etag_matches",
+    "export_response",
+    "fan_out_task_event",
     "generate_task_key",
+    "get_cached_user",
+    "invalidate_cached_user",
+    "load_board",
+    "load_for_response",
+    "mark_notifications_read",
+    "not_modified",
+    "notification_broker",
+    "paginate",
+    "paginate_rows",
+    "project_analytics",
+    "project_members_etag",
+    "project_tasks_etag",
+    "read_bulk_items",
+    "record_status_changes",
+    "response_cache",
     "save_avatar_file",
+    "search_tasks",
+    "sse_events",
+    "task_etag",
+    "task_export_query",
+    "too_many_items",
     "validate_image",
 ]
@@ -0,0 +1,150 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import BigInteger, Integer, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.enums import StatusEnum
+from app.models import Project, ProjectStatusRollup, Status
+
+ROLLUP_COUNTERS = ("entered", "exited", "entered_age")
+
+
+async def record_status_changes(
+    db: AsyncSession,
+    changes: Iterable[tuple[int, int | None, int | None, datetime | None]],
+) -> None:
+    """Count task status changes into today's rollups.
+
+    Each change is (project_id, from_status_id, to_status_id, created_at)
+    of one task; a new task has no from status and a deleted one no to
+    status. Call it in the transaction that makes the changes.
+    """
+    now = datetime.now(UTC)
+    totals = defaultdict(lambda: dict.fromkeys(ROLLUP_COUNTERS, 0))
+
+    for project_id, from_status_id, to_status_id, created_at in changes:
+        if from_status_id == to_status_id:
+            continue
+
+        if from_status_id is not None:
+            totals[project_id, from_status_id]["exited"] += 1
+
+        if to_status_id is not None:
+            total = totals[project_id, to_status_id]
+            total["entered"] += 1
+
+            if created_at is not None:
+                total["entered_age"] += int((now - created_at).total_seconds())
+
+    if not totals:
+        return
+
+    # Upserted in key order so that concurrent writers cannot deadlock.
+    stmt = insert(ProjectStatusRollup).values(
+        [
+            {"project_id": project_id, "status_id": status_id, "day": now.date()}
+            | counters
+            for (project_id, status_id), counters in sorted(totals.items())
+        ]
+    )
+
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["project_id", "status_id", "day"],
+            set_={
+                name: getattr(ProjectStatusRollup, name) + getattr(stmt.excluded, name)
+                for name in ROLLUP_COUNTERS
+            },
+        )
+    )
+
+
+async def project_analytics(db: AsyncSession, project: Project, days: int) -> dict:
+    """Daily burndown, throughput and cycle time of a project, up to today.
+
+    remaining counts the tasks not done at the end of each day, completed
+    the tasks that entered the done status that day, and cycle_time_hours
+    their average age, i.e. creation to completion, or None.
+
+    One query reads the rollups, folding the days before the window into
+    a baseline, as one row of arrays per status. The series are then
+    computed with NumPy over a status by day grid, so the cost depends on
+    the number of days and statuses, not on the number of tasks.
+    """
+    end = datetime.now(UTC).date()
+    start = end - timedelta(days=days - 1)
+
+    # Column 0 of the grid holds the baseline, everything before the
+    # window, and column i the i-th day of it.
+    column = func.greatest(ProjectStatusRollup.day - start + 1, 0, type_=Integer).label(
+        "column"
+    )
+
+    totals = (
+        select(
+            ProjectStatusRollup.status_id,
+            column,
+            *(
+                func.sum(getattr(ProjectStatusRollup, name), type_=BigInteger).label(
+                    name
+                )
+                for name in ROLLUP_COUNTERS
+            ),
+        )
+        .where(
+            ProjectStatusRollup.project_id == project.id,
+            ProjectStatusRollup.day <= end,
+        )
+        .group_by(ProjectStatusRollup.status_id, column)
+        .subquery()
+    )
+
+    # Arrays keep the result to a row per status instead of one per day.
+    rows = (
+        await db.execute(
+            select(
+                Status.name,
+                func.array_agg(totals.c.column),
+                *(func.array_agg(totals.c[name]) for name in ROLLUP_COUNTERS),
+            )
+            .join(totals, totals.c.status_id == Status.id)
+            .group_by(Status.id)
+        )
+    ).all()
+
+    is_done = np.array([name == StatusEnum.DONE.value for name, *_ in rows], bool)
+
+    shape = (len(rows), days + 1)
+    entered = np.zeros(shape, dtype=np.int64)
+    exited = np.zeros(shape, dtype=np.int64)
+    entered_age = np.zeros(shape, dtype=np.int64)
+
+    for i, (_, columns, *counters) in enumerate(rows):
+        for grid, values in zip((entered, exited, entered_age), counters, strict=True):
+            grid[i, columns] = values
+
+    counts = np.cumsum(entered - exited, axis=1)[:, 1:]
+    remaining = counts[~is_done].sum(axis=0)
+    completed = entered[is_done, 1:].sum(axis=0)
+    completed_age = entered_age[is_done, 1:].sum(axis=0)
+
+    cycle_time = np.divide(
+        completed_age / 3600,
+        completed,
+        out=np.full(days, np.nan),
+        where=completed > 0,
+    ).round(2)
+
+    return {
+        "start": start,
+        "end": end,
+        "remaining": remaining.tolist(),
+        "completed": completed.tolist(),
+        "cycle_time_hours": [
+            None if np.isnan(hours) else hours for hours in cycle_time.tolist()
+        ],
+    }
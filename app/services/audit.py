@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from datetime import UTC, datetime
+from time import monotonic, perf_counter
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.models import AuditLog, Task
+from app.settings import AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL, AUDIT_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """Collects audit entries in memory and writes them in batches.
+
+    Requests only enqueue, so auditing adds no write latency. When the
+    queue is full new entries are dropped and counted, rather than
+    blocking the request or growing without bound.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval: float):
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.closing = False
+        self.task: asyncio.Task | None = None
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.flush_time_total = 0.0
+        self.flush_time_max = 0.0
+
+    def record(self, user_id: int, action: str, task_id: int | None = None) -> None:
+        entry = {
+            "user_id": user_id,
+            "task_id": task_id,
+            "action": action,
+            "timestamp": datetime.now(UTC),
+        }
+
+        try:
+            self.queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return
+
+        self.enqueued += 1
+
+    def start(self) -> None:
+        self.closing = False
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        # The loop drains whatever is still queued before it returns.
+        self.closing = True
+
+        if self.task:
+            await self.task
+            self.task = None
+
+    async def run(self) -> None:
+        while not (self.closing and self.queue.empty()):
+            batch = await self.collect()
+
+            if batch:
+                await self.flush(batch)
+
+    async def collect(self) -> list[dict]:
+        batch = []
+        deadline = monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+
+            timeout = deadline - monotonic()
+
+            if self.closing or timeout <= 0:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except TimeoutError:
+                break
+
+        return batch
+
+    async def flush(self, batch: list[dict]) -> None:
+        started = perf_counter()
+
+        try:
+            try:
+                await self.insert(batch)
+            except IntegrityError:
+                # A task deleted before its entries were written; keep the
+                # entries without the link.
+                await self.insert(await self.unlink_deleted_tasks(batch))
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Failed to write %d audit entries", len(batch))
+            return
+
+        elapsed = perf_counter() - started
+        self.written += len(batch)
+        self.batches += 1
+        self.flush_time_total += elapsed
+        self.flush_time_max = max(self.flush_time_max, elapsed)
+
+    async def insert(self, batch: list[dict]) -> None:
+        async with SessionLocal() as db:
+            await db.execute(insert(AuditLog), batch)
+            await db.commit()
+
+    async def unlink_deleted_tasks(self, batch: list[dict]) -> list[dict]:
+        task_ids = {entry["task_id"] for entry in batch if entry["task_id"]}
+
+        async with SessionLocal() as db:
+            existing = set(
+                await db.scalars(select(Task.id).where(Task.id.in_(task_ids)))
+            )
+
+        return [
+            {
+                **entry,
+                "task_id": entry["task_id"] if entry["task_id"] in existing else None,
+            }
+            for entry in batch
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_max": self.queue.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "flush_time_avg_ms": self.flush_time_total / max(self.batches, 1) * 1000,
+            "flush_time_max_ms": self.flush_time_max * 1000,
+        }
+
+
+audit_writer = AuditWriter(
+    max_queue=AUDIT_QUEUE_SIZE,
+    batch_size=AUDIT_BATCH_SIZE,
+    flush_interval=AUDIT_FLUSH_INTERVAL,
+)
@@ -0,0 +1,67 @@
+from sqlalchemy import func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Project, Status, Task
+from app.responses import row_builder
+from app.schemas import TaskBoardCardNested
+
+
+async def load_board(db: AsyncSession, project: Project, limit: int) -> dict:
+    """A project's tasks grouped into one column per status, in one query.
+
+    Each column has the status's task count and its first limit tasks by
+    id. The window runs over ids only, read in order from the
+    (project_id, status_id, id) index; just the tasks that make the cut
+    are looked up for their fields. Statuses without tasks are empty
+    columns.
+    """
+    # One window for both, framed over the whole column, is one pass.
+    window = {"partition_by": Task.status_id, "order_by": Task.id, "rows": (None, None)}
+    numbered = (
+        select(
+            Task.id,
+            Task.status_id,
+            func.row_number().over(**window).label("position"),
+            func.count().over(**window).label("total"),
+        )
+        .where(Task.project_id == project.id)
+        .subquery()
+    )
+    # Filtered outside the window so that Postgres can stop numbering early.
+    ranked = select(numbered).where(numbered.c.position <= limit).subquery()
+
+    # Postgres cannot estimate how few rows the filter keeps and would join
+    # the whole tasks table; the LIMIT keeps this lateral a lookup by id.
+    card = (
+        select(*TaskBoardCardNested.row_columns)
+        .join(Task.assignee)
+        .where(Task.id == ranked.c.id)
+        .limit(1)
+        .lateral()
+    )
+
+    rows = await db.execute(
+        select(Status.id, Status.name, ranked.c.total, *card.c)
+        .select_from(Status)
+        .outerjoin(ranked, ranked.c.status_id == Status.id)
+        .outerjoin(card, true())
+        .order_by(Status.id, ranked.c.position)
+    )
+
+    build_card = row_builder(TaskBoardCardNested)
+    columns = {}
+
+    for status_id, name, total, *fields in rows:
+        column = columns.get(status_id)
+
+        if column is None:
+            column = columns[status_id] = {
+                "status": {"id": status_id, "name": name},
+                "count": total or 0,
+                "tasks": [],
+            }
+
+        if total is not None:
+            column["tasks"].append(build_card(fields))
+
+    return {"project": {"key": project.key}, "columns": list(columns.values())}
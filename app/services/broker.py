@@ -0,0 +1,307 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from time import monotonic
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import ASYNC_DB_URL, SessionLocal
+from app.models import Notification
+from app.settings import (
+    NOTIFICATION_BROKER_BACKEND,
+    NOTIFICATION_HEARTBEAT_INTERVAL,
+    NOTIFICATION_STREAM_MAX_AGE,
+    NOTIFICATION_STREAM_QUEUE_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "notifications"
+# pg_notify payloads are limited to 8000 bytes; large fan-outs are split.
+NOTIFY_CHUNK_SIZE = 200
+
+RECONNECT_DELAY_MS = 1000
+RESET_EVENT = "event: reset\ndata: {}\n\n"
+
+
+class Subscription:
+    """One connected client's bounded queue of pending notifications.
+
+    A client that falls too far behind is not allowed to grow the queue:
+    it is cut off with a reset, and reloads its notifications through the
+    list endpoint when it reconnects.
+    """
+
+    def __init__(self, user_id: int, max_queue: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[dict | None] = asyncio.Queue(maxsize=max_queue)
+        self.closed = False
+
+    def put(self, message: dict) -> bool:
+        if self.closed:
+            return False
+
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.close()
+            return False
+
+        return True
+
+    def close(self) -> None:
+        # Pending messages are discarded so the end marker always fits.
+        self.closed = True
+
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+        self.queue.put_nowait(None)
+
+
+class LocalBackend:
+    """Delivers events to this process only; for a single worker and tests."""
+
+    def __init__(self, broker: "NotificationBroker"):
+        self.broker = broker
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, db: AsyncSession, event: dict) -> None:
+        self.broker.deliver(event)
+
+
+class PostgresBackend:
+    """Relays events between workers through Postgres LISTEN/NOTIFY.
+
+    Every worker, the publishing one included, receives events through its
+    own listening connection, which is reconnected if it is lost.
+    """
+
+    channel = NOTIFY_CHANNEL
+
+    def __init__(self, broker: "NotificationBroker"):
+        self.broker = broker
+        self.dsn = make_url(ASYNC_DB_URL).set(drivername="postgresql")
+        self.task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self.task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def listen(self) -> None:
+        while True:
+            try:
+                conn = await asyncpg.connect(
+                    self.dsn.render_as_string(hide_password=False)
+                )
+            except (OSError, asyncpg.PostgresError):
+                logger.exception("Listener on %s failed to connect", self.channel)
+                await asyncio.sleep(NOTIFICATION_HEARTBEAT_INTERVAL)
+                continue
+
+            try:
+                await conn.add_listener(self.channel, self.receive)
+
+                while not conn.is_closed():
+                    await asyncio.sleep(NOTIFICATION_HEARTBEAT_INTERVAL)
+            finally:
+                await conn.close()
+
+            logger.warning("Listener on %s lost its connection", self.channel)
+
+    def receive(self, conn, pid: int, channel: str, payload: str) -> None:
+        self.broker.deliver(json.loads(payload))
+
+    async def publish(self, db: AsyncSession, event: dict) -> None:
+        recipients = event["recipients"]
+
+        for start in range(0, len(recipients), NOTIFY_CHUNK_SIZE):
+            chunk = {
+                **event,
+                "recipients": recipients[start : start + NOTIFY_CHUNK_SIZE],
+            }
+            await db.execute(
+                select(func.pg_notify(self.channel, json.dumps(chunk, default=str)))
+            )
+
+        await db.commit()
+
+
+BACKENDS = {"local": LocalBackend, "postgres": PostgresBackend}
+
+
+class NotificationBroker:
+    """In-process pub/sub of new notifications, keyed by recipient.
+
+    An event is one notification message sent to many recipients:
+    ``{"recipients": [[recipient_id, notification_id], ...], **fields}``.
+    The backend carries events to every worker; each worker hands them to
+    the subscriptions of its own connected users.
+    """
+
+    def __init__(self, backend: str, max_queue: int):
+        self.backend = BACKENDS[backend](self)
+        self.max_queue = max_queue
+        self.subscriptions: defaultdict[int, set[Subscription]] = defaultdict(set)
+        self.delivered = 0
+        self.overflowed = 0
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+        for subscriptions in self.subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+    async def publish(self, db: AsyncSession, event: dict) -> None:
+        await self.backend.publish(db, event)
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, self.max_queue)
+        self.subscriptions[user_id].add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self.subscriptions.get(subscription.user_id)
+
+        if subscriptions is None:
+            return
+
+        subscriptions.discard(subscription)
+
+        if not subscriptions:
+            del self.subscriptions[subscription.user_id]
+
+    def deliver(self, event: dict) -> None:
+        fields = {key: value for key, value in event.items() if key != "recipients"}
+
+        for recipient_id, notification_id in event["recipients"]:
+            for subscription in self.subscriptions.get(recipient_id, ()):
+                message = {"id": notification_id, "recipient_id": recipient_id}
+
+                if subscription.put({**message, **fields}):
+                    self.delivered += 1
+                else:
+                    self.overflowed += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "users": len(self.subscriptions),
+            "connections": sum(map(len, self.subscriptions.values())),
+            "delivered": self.delivered,
+            "overflowed": self.overflowed,
+        }
+
+
+def sse_message(message: dict) -> str:
+    return (
+        f"id: {message['id']}\nevent: notification\n"
+        f"data: {json.dumps(message, default=str)}\n\n"
+    )
+
+
+async def missed_notifications(
+    user_id: int, last_event_id: int, limit: int
+) -> list[dict] | None:
+    # None when more were missed than a reconnecting client should replay.
+    async with SessionLocal() as db:
+        rows = await db.execute(
+            select(
+                Notification.id,
+                Notification.recipient_id,
+                Notification.sender_id,
+                Notification.task_id,
+                Notification.project_id,
+                Notification.message,
+                Notification.created_at,
+                Notification.is_read,
+            )
+            .where(
+                Notification.recipient_id == user_id,
+                Notification.id > last_event_id,
+            )
+            .order_by(Notification.id)
+            .limit(limit + 1)
+        )
+        missed = [
+            {**row, "created_at": row["created_at"].isoformat()}
+            for row in rows.mappings()
+        ]
+
+    return missed if len(missed) <= limit else None
+
+
+async def sse_events(
+    user_id: int, last_event_id: int | None = None
+) -> AsyncIterator[str]:
+    """Server-sent events of a user's new notifications, with idle heartbeats.
+
+    The heartbeat comments keep proxies from closing an idle stream, and
+    writing them is how a silently dropped client is noticed. Streams end
+    after NOTIFICATION_STREAM_MAX_AGE so that workers can shut down; the
+    client reconnects with Last-Event-ID and gets what it missed replayed.
+    """
+    # Subscribe before replaying so nothing created in between is lost.
+    subscription = notification_broker.subscribe(user_id)
+    deadline = monotonic() + NOTIFICATION_STREAM_MAX_AGE
+
+    try:
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+
+        if last_event_id is not None:
+            missed = await missed_notifications(
+                user_id, last_event_id, subscription.queue.maxsize
+            )
+
+            if missed is None:
+                yield RESET_EVENT
+                return
+
+            for message in missed:
+                yield sse_message(message)
+                last_event_id = message["id"]
+
+        while (timeout := deadline - monotonic()) > 0:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(),
+                    min(NOTIFICATION_HEARTBEAT_INTERVAL, timeout),
+                )
+            except TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+
+            if message is None:
+                yield RESET_EVENT
+                break
+
+            if last_event_id is None or message["id"] > last_event_id:
+                yield sse_message(message)
+    finally:
+        notification_broker.unsubscribe(subscription)
+
+
+notification_broker = NotificationBroker(
+    backend=NOTIFICATION_BROKER_BACKEND,
+    max_queue=NOTIFICATION_STREAM_QUEUE_SIZE,
+)
@@ -0,0 +1,96 @@
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+
+from app.settings import BULK_MAX_ITEMS
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def bulk_error(index: int, detail: str) -> dict:
+    return {"index": index, "detail": detail}
+
+
+def format_validation_error(err: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, error['loc'])) or 'item'}: {error['msg']}"
+        for error in err.errors()
+    )
+
+
+async def iter_ndjson_lines(request: Request) -> AsyncIterator[bytes]:
+    buffer = b""
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+
+        for line in lines:
+            if line.strip():
+                yield line
+
+    if buffer.strip():
+        yield buffer
+
+
+def too_many_items() -> HTTPException:
+    return HTTPException(
+        status_code=413, detail=f"At most {BULK_MAX_ITEMS} items per request"
+    )
+
+
+async def read_ndjson_items[T: BaseModel](
+    request: Request, model: type[T]
+) -> tuple[list[tuple[int, T]], list[dict]]:
+    items, errors = [], []
+    index = 0
+
+    async for line in iter_ndjson_lines(request):
+        if index >= BULK_MAX_ITEMS:
+            raise too_many_items()
+
+        try:
+            items.append((index, model.model_validate_json(line)))
+        except ValidationError as err:
+            errors.append(bulk_error(index, format_validation_error(err)))
+
+        index += 1
+
+    return items, errors
+
+
+async def read_bulk_items[T: BaseModel](
+    request: Request, model: type[T]
+) -> tuple[list[tuple[int, T]], list[dict]]:
+    """Validate a JSON array or NDJSON body item by item.
+
+    Returns the valid items with their position in the body, and an error
+    entry for every item that failed validation.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type == NDJSON_MEDIA_TYPE:
+        return await read_ndjson_items(request, model)
+
+    items, errors = [], []
+
+    try:
+        raw_items = json.loads(await request.body())
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail="Invalid JSON body") from err
+
+    if not isinstance(raw_items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array")
+
+    if len(raw_items) > BULK_MAX_ITEMS:
+        raise too_many_items()
+
+    for index, raw in enumerate(raw_items):
+        try:
+            items.append((index, model.model_validate(raw)))
+        except ValidationError as err:
+            errors.append(bulk_error(index, format_validation_error(err)))
+
+    return items, errors
@@ -0,0 +1,115 @@
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models import Project, ProjectMember, Task, User
+from app.schemas import PageParams
+
+
+def weak_etag(*parts) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, which ignores the W/ prefix.
+    header = request.headers.get("if-none-match")
+
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def version_columns(*columns) -> list:
+    """Aggregates that change whenever a collection's rows do.
+
+    The count catches deletes, the max catches inserts and updates. The
+    sum also catches an update whose transaction started, and so took its
+    now(), before the newest one but committed after it.
+    """
+    aggregates = [func.count()]
+
+    for column in columns:
+        aggregates += [func.max(column), func.sum(func.extract("epoch", column))]
+
+    return aggregates
+
+
+async def task_etag(db: AsyncSession, task_key: str) -> str | None:
+    # Versions everything TaskDetailResponse shows; None if there is no task.
+    assignee = aliased(User)
+    reporter = aliased(User)
+
+    version = (
+        await db.execute(
+            select(
+                Task.id,
+                Task.updated_at,
+                Project.updated_at,
+                assignee.updated_at,
+                reporter.updated_at,
+            )
+            .join(Task.project)
+            .outerjoin(assignee, Task.assignee)
+            .outerjoin(reporter, Task.reporter)
+            .where(Task.key == task_key)
+        )
+    ).one_or_none()
+
+    return weak_etag(*version) if version else None
+
+
+async def project_tasks_etag(
+    db: AsyncSession, project: Project, page: PageParams
+) -> str:
+    version = (
+        await db.execute(
+            select(*version_columns(Task.updated_at)).where(
+                Task.project_id == project.id
+            )
+        )
+    ).one()
+
+    # Items embed the project's key.
+    return weak_etag(*version, project.updated_at, page.cursor, page.limit)
+
+
+async def project_members_etag(
+    db: AsyncSession, project: Project, page: PageParams
+) -> str:
+    version = (
+        await db.execute(
+            select(*version_columns(ProjectMember.joined_at, User.updated_at))
+            .join(ProjectMember.user)
+            .where(ProjectMember.project_id == project.id)
+        )
+    ).one()
+
+    return weak_etag(*version, page.cursor, page.limit)
+
+
+async def board_etag(db: AsyncSession, project: Project, limit: int) -> str:
+    # Cards embed their assignee, so the assignees are versioned too.
+    version = (
+        await db.execute(
+            select(*version_columns(Task.updated_at, User.updated_at))
+            .join(Task.assignee)
+            .where(Task.project_id == project.id)
+        )
+    ).one()
+
+    return weak_etag(*version, project.updated_at, limit)
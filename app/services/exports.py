@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from app.database import SessionLocal
+from app.enums import ExportFormatEnum
+from app.models import Status, Task
+from app.settings import EXPORT_BATCH_SIZE
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormatEnum.ndjson: "application/x-ndjson",
+    ExportFormatEnum.csv: "text/csv",
+}
+
+
+def task_export_query(project_id: int) -> Select:
+    return (
+        select(
+            Task.id,
+            Task.key,
+            Task.summary,
+            Task.description,
+            Status.name.label("status"),
+            Task.priority,
+            Task.assignee_id,
+            Task.reporter_id,
+            Task.due_date,
+            Task.created_at,
+            Task.updated_at,
+        )
+        .join(Status, Task.status_id == Status.id)
+        .where(Task.project_id == project_id)
+        .order_by(Task.id)
+    )
+
+
+async def stream_partitions(stmt: Select) -> AsyncIterator[list]:
+    # The request's session is closed before the body is sent, so the export
+    # holds its own connection for as long as the server-side cursor is open.
+    async with SessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+        async for rows in result.partitions():
+            yield rows
+
+
+async def ndjson_lines(stmt: Select) -> AsyncIterator[str]:
+    async for rows in stream_partitions(stmt):
+        yield "".join(
+            json.dumps(row._asdict(), default=datetime.isoformat) + "\n" for row in rows
+        )
+
+
+async def csv_lines(stmt: Select) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow(stmt.selected_columns.keys())
+    yield drain()
+
+    async for rows in stream_partitions(stmt):
+        writer.writerows(rows)
+        yield drain()
+
+
+def export_response(
+    stmt: Select, export_format: ExportFormatEnum, filename: str
+) -> StreamingResponse:
+    lines = ndjson_lines if export_format == ExportFormatEnum.ndjson else csv_lines
+
+    return StreamingResponse(
+        lines(stmt),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'
+        },
+    )
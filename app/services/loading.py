@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import Base
+
+
+async def load_for_response(
+    db: AsyncSession, model: type[Base], pk: int, schema: type[BaseModel]
+):
+    return await db.scalar(
+        select(model)
+        .where(model.id == pk)
+        .options(*schema.load_options)
+        .execution_options(populate_existing=True)
+    )
@@ -0,0 +1,182 @@
+import logging
+
+from sqlalchemy import func, insert, literal, select, union, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal
+from app.models import Notification, Project, ProjectMember, Task, User
+from app.services.broker import notification_broker
+
+logger = logging.getLogger(__name__)
+
+
+def task_recipients(task_id: int, include_members: bool):
+    # UNION removes duplicates, e.g. an assignee who is also a member.
+    recipients = [
+        select(Task.assignee_id.label("user_id")).where(Task.id == task_id),
+        select(Task.reporter_id.label("user_id")).where(Task.id == task_id),
+    ]
+
+    if include_members:
+        recipients += [
+            select(ProjectMember.user_id.label("user_id"))
+            .join(Task, Task.project_id == ProjectMember.project_id)
+            .where(Task.id == task_id),
+            select(Project.owner_id.label("user_id"))
+            .join(Task, Task.project_id == Project.id)
+            .where(Task.id == task_id),
+        ]
+
+    return union(*recipients).subquery()
+
+
+async def add_unread(db: AsyncSession, user_ids: list[int]) -> None:
+    if not user_ids:
+        return
+
+    # Lock the counters in id order so overlapping fan-outs cannot deadlock.
+    locked = (
+        select(User.id).where(User.id.in_(user_ids)).order_by(User.id).with_for_update()
+    )
+
+    # The counter is bookkeeping, not a profile edit: updated_at stays put.
+    await db.execute(
+        update(User)
+        .where(User.id.in_(locked))
+        .values(
+            unread_notifications=User.unread_notifications + 1,
+            updated_at=User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def discard_unread(db: AsyncSession, task_id: int) -> None:
+    # Unread notifications of a task about to be deleted leave the counters.
+    counts = (
+        select(Notification.recipient_id, func.count().label("unread"))
+        .where(Notification.task_id == task_id, Notification.is_read.is_(False))
+        .group_by(Notification.recipient_id)
+        .subquery()
+    )
+    locked = (
+        select(User.id)
+        .where(User.id.in_(select(counts.c.recipient_id)))
+        .order_by(User.id)
+        .with_for_update()
+    )
+
+    await db.execute(
+        update(User)
+        .where(User.id == counts.c.recipient_id, User.id.in_(locked))
+        .values(
+            unread_notifications=func.greatest(
+                User.unread_notifications - counts.c.unread, 0
+            ),
+            updated_at=User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def mark_notifications_read(
+    db: AsyncSession, user_id: int, ids: list[int] | None = None
+) -> tuple[int, int]:
+    """Mark a user's notifications read, all of them or those in ids.
+
+    One UPDATE marks the rows and the unread counter drops by the number
+    actually changed, so concurrent or repeated calls never count a
+    notification twice. Returns (marked, unread).
+    """
+    stmt = (
+        update(Notification)
+        .where(Notification.recipient_id == user_id, Notification.is_read.is_(False))
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+
+    if ids is not None:
+        stmt = stmt.where(Notification.id.in_(ids))
+
+    marked = (await db.execute(stmt)).rowcount
+
+    unread = await db.scalar(
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            unread_notifications=func.greatest(User.unread_notifications - marked, 0),
+            updated_at=User.updated_at,
+        )
+        .returning(User.unread_notifications)
+        .execution_options(synchronize_session=False)
+    )
+
+    return marked, unread
+
+
+async def fan_out_task_event(
+    sender_id: int, task_id: int, message: str, include_members: bool = True
+) -> list[int]:
+    """Notify everyone involved in a task, except the sender, of one event.
+
+    Recipients are the task's assignee and reporter, plus the project's
+    owner and members when include_members is set. They are resolved and
+    inserted by a single INSERT ... SELECT, so the cost does not grow with
+    round trips per member. Meant to run as a background task after the
+    response; the new notifications are then pushed to connected clients.
+    Returns the ids of the notified users.
+    """
+    recipients = task_recipients(task_id, include_members)
+
+    stmt = (
+        insert(Notification)
+        .from_select(
+            ["recipient_id", "sender_id", "task_id", "project_id", "message"],
+            select(
+                recipients.c.user_id,
+                literal(sender_id),
+                Task.id,
+                Task.project_id,
+                literal(message),
+            )
+            .join(Task, Task.id == task_id)
+            .where(
+                recipients.c.user_id.is_not(None),
+                recipients.c.user_id != sender_id,
+            ),
+        )
+        .returning(
+            Notification.recipient_id,
+            Notification.id,
+            Notification.task_id,
+            Notification.project_id,
+            Notification.created_at,
+        )
+    )
+
+    try:
+        async with SessionLocal() as db:
+            rows = (await db.execute(stmt)).all()
+            await add_unread(db, [row.recipient_id for row in rows])
+            await db.commit()
+
+            if rows:
+                await notification_broker.publish(
+                    db,
+                    {
+                        "recipients": [[row.recipient_id, row.id] for row in rows],
+                        "sender_id": sender_id,
+                        "task_id": rows[0].task_id,
+                        "project_id": rows[0].project_id,
+                        "message": message,
+                        "created_at": rows[0].created_at.isoformat(),
+                        "is_read": False,
+                    },
+                )
+    except Exception:
+        # The response has already been sent; a lost notification must not
+        # surface as an error.
+        logger.exception("Failed to notify about task %d: %s", task_id, message)
+        return []
+
+    return [row.recipient_id for row in rows]
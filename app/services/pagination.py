@@ -0,0 +1,109 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import BigInteger, Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.responses import dump_rows
+from app.schemas.pagination import PageParams
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, default=datetime.isoformat)
+
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_value(key, value):
+    # Cursors come from clients; a value the key's column cannot hold would
+    # otherwise only fail in the driver.
+    python_type = key.type.python_type
+
+    if python_type is datetime:
+        if not isinstance(value, str):
+            raise TypeError("Expected a timestamp")
+        return datetime.fromisoformat(value)
+
+    if python_type is int:
+        bound = 2**63 if isinstance(key.type, BigInteger) else 2**31
+        if type(value) is not int or not -bound <= value < bound:
+            raise ValueError("Expected an integer")
+        return value
+
+    if python_type is float:
+        if type(value) not in (int, float):
+            raise TypeError("Expected a number")
+        return float(value)
+
+    if type(value) is not python_type:
+        raise TypeError(f"Expected {python_type.__name__}")
+
+    return value
+
+
+def decode_cursor(cursor: str, keys: tuple) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("Cursor does not match the ordering keys")
+
+        return [
+            decode_value(key, value) for key, value in zip(keys, values, strict=True)
+        ]
+    except (TypeError, ValueError) as err:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from err
+
+
+def apply_keyset(
+    stmt: Select, page: PageParams, *keys, descending: bool = False
+) -> Select:
+    if page.cursor:
+        values = decode_cursor(page.cursor, keys)
+        position = tuple_(*keys)
+        stmt = stmt.where(
+            position < tuple_(*values) if descending else position > tuple_(*values)
+        )
+
+    order_by = [key.desc() for key in keys] if descending else list(keys)
+
+    return stmt.order_by(*order_by).limit(page.limit + 1)
+
+
+async def paginate(
+    db: AsyncSession, stmt: Select, page: PageParams, *keys, descending: bool = False
+) -> dict:
+    result = await db.scalars(apply_keyset(stmt, page, *keys, descending=descending))
+    items = result.all()
+
+    next_cursor = None
+    if len(items) > page.limit:
+        items = items[: page.limit]
+        next_cursor = encode_cursor([getattr(items[-1], key.key) for key in keys])
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def paginate_rows(
+    db: AsyncSession,
+    stmt: Select,
+    page: PageParams,
+    schema: type[BaseModel],
+    *keys,
+    descending: bool = False,
+) -> dict:
+    # Like paginate, for a select of schema.row_columns; items are plain dicts.
+    rows = (
+        await db.execute(apply_keyset(stmt, page, *keys, descending=descending))
+    ).all()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = encode_cursor([getattr(rows[-1], key.key) for key in keys])
+
+    return {"items": dump_rows(schema, rows), "next_cursor": next_cursor}
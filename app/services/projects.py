@@ -1,14 +1,69 @@
-from sqlalchemy.orm import Session
+import re
+
+from fastapi import HTTPException
+from sqlalchemy import Numeric, cast, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Project
 
+PROJECT_KEY_PREFIX_LENGTH = 3
+PROJECT_KEY_ATTEMPTS = 5
+
+
+def project_key_prefix(name: str) -> str:
+    letters = re.sub(r"[^A-Z]", "", name.upper())
+
+    return letters[:PROJECT_KEY_PREFIX_LENGTH] or "PRJ"
+
+
+async def next_project_key(db: AsyncSession, prefix: str) -> str:
+    # The bare prefix counts as 1. Numeric, because a key edited by hand can
+    # carry more digits than any integer type holds.
+    suffix = func.coalesce(
+        cast(func.nullif(func.substring(Project.key, len(prefix) + 1), ""), Numeric),
+        1,
+    )
+
+    # LIKE 'PRE%' is served by the varchar_pattern_ops index on projects.key.
+    highest = await db.scalar(
+        select(func.max(suffix)).where(
+            Project.key.like(f"{prefix}%"),
+            Project.key.regexp_match(f"^{prefix}[0-9]*$"),
+        )
+    )
+
+    if highest is None:
+        return prefix
+
+    return prefix + str(int(highest) + 1)
+
+
+async def allocate_project_key(db: AsyncSession, project: Project, name: str) -> None:
+    prefix = project_key_prefix(name)
+
+    if project.key and re.fullmatch(rf"{prefix}\d*", project.key):
+        return
 
-def generate_project_key(db: Session, name: str) -> str:
-    generated_name = name.upper()[:3]
+    # Flush everything else first so a failed savepoint only rolls back the key.
+    await db.flush()
 
-    how_many_in_db = db.query(Project).filter(Project.name == generated_name).count()
+    # Serialize allocations of the same prefix until this transaction ends;
+    # the savepoint retry below only covers keys written around the allocator.
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(prefix))))
 
-    if how_many_in_db > 0:
-        generated_name += str(how_many_in_db + 1)
+    for _ in range(PROJECT_KEY_ATTEMPTS):
+        key = await next_project_key(db, prefix)
+        try:
+            # begin_nested() flushes pending changes before the SAVEPOINT,
+            # so the key has to be assigned inside it.
+            async with db.begin_nested():
+                project.key = key
+                await db.flush()
+            return
+        except IntegrityError:
+            continue
 
-    return generated_name
+    raise HTTPException(
+        status_code=409, detail="Could not allocate a project key, try again"
+    )
@@ -0,0 +1,179 @@
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import TTLCache
+from app.services import broker
+from app.services.etags import etag_matches, not_modified
+from app.settings import (
+    RESPONSE_CACHE_BACKEND,
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL,
+)
+
+INVALIDATE_CHANNEL = "response_cache"
+INVALIDATE_CHUNK_SIZE = 200
+
+
+@dataclass(frozen=True, slots=True)
+class CacheKey:
+    value: str
+    # When the request began; data read after this is at least this fresh.
+    started: float
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str]
+    tags: frozenset[str]
+    started: float
+
+
+class PostgresBackend(broker.PostgresBackend):
+    """Relays invalidations to every worker through Postgres LISTEN/NOTIFY.
+
+    Each worker keeps its own entries; only the invalidations are shared.
+    """
+
+    channel = INVALIDATE_CHANNEL
+
+    async def publish(self, db: AsyncSession, event: dict) -> None:
+        # Dropped here at once, so this worker reads its own writes.
+        self.broker.deliver(event)
+
+        tags = event["tags"]
+
+        for start in range(0, len(tags), INVALIDATE_CHUNK_SIZE):
+            chunk = {"tags": tags[start : start + INVALIDATE_CHUNK_SIZE]}
+            await db.execute(select(func.pg_notify(self.channel, json.dumps(chunk))))
+
+        await db.commit()
+
+
+BACKENDS = {"local": broker.LocalBackend, "postgres": PostgresBackend}
+
+
+class ResponseCache:
+    """Rendered responses of hot read endpoints, invalidated by tag.
+
+    Endpoints store responses with the tags of the data they show, e.g.
+    ``project:1:tasks`` or ``user:7``, and writes invalidate those tags.
+    Invalidation is lazy: it only records when each tag last changed, and
+    an entry is stale if any of its tags changed after its request began.
+    That also rejects responses built from data a concurrent write has
+    since replaced.
+    """
+
+    def __init__(self, backend: str, maxsize: int, ttl: float):
+        self.backend = BACKENDS[backend](self)
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.invalidated: OrderedDict[str, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.stored = 0
+        self.invalidations = 0
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    def key(self, request: Request, scope: str = "shared") -> CacheKey:
+        # scope tells apart callers who may see different responses; routes
+        # that show everyone the same thing share one entry per URL.
+        query = urlencode(sorted(request.query_params.multi_items()))
+
+        return CacheKey(f"{scope}|{request.url.path}?{query}", monotonic())
+
+    def is_stale(self, entry: CachedResponse) -> bool:
+        return any(
+            self.invalidated.get(tag, -1.0) >= entry.started for tag in entry.tags
+        )
+
+    def get(self, key: CacheKey, request: Request) -> Response | None:
+        entry = self.entries.get(key.value)
+
+        if entry is not None and self.is_stale(entry):
+            self.entries.pop(key.value)
+            self.stale += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        etag = entry.headers.get("etag")
+
+        if etag and etag_matches(request, etag):
+            return not_modified(etag)
+
+        return Response(entry.body, headers=entry.headers)
+
+    def store(self, key: CacheKey, response: Response, tags) -> Response:
+        entry = CachedResponse(
+            body=response.body,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name != "content-length"
+            },
+            tags=frozenset(tags),
+            started=key.started,
+        )
+
+        if not self.is_stale(entry):
+            self.entries.set(key.value, entry)
+            self.stored += 1
+
+        return response
+
+    def deliver(self, event: dict) -> None:
+        now = monotonic()
+
+        for tag in event["tags"]:
+            self.invalidated[tag] = now
+            self.invalidated.move_to_end(tag)
+            self.invalidations += 1
+
+        # Entries outlive no invalidation older than the TTL, as store
+        # already rejects responses that were stale when they were built.
+        while self.invalidated:
+            tag, invalidated_at = next(iter(self.invalidated.items()))
+            if invalidated_at >= now - self.ttl:
+                break
+            del self.invalidated[tag]
+
+    async def invalidate(self, db: AsyncSession, *tags: str) -> None:
+        # Call after the write has committed.
+        if tags:
+            await self.backend.publish(db, {"tags": list(tags)})
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "size": len(self.entries),
+            "maxsize": self.entries.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "stored": self.stored,
+            "invalidations": self.invalidations,
+        }
+
+
+response_cache = ResponseCache(
+    backend=RESPONSE_CACHE_BACKEND,
+    maxsize=RESPONSE_CACHE_SIZE,
+    ttl=RESPONSE_CACHE_TTL,
+)
@@ -0,0 +1,99 @@
+from sqlalchemy import Float, Select, case, func, select, true, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.enums import RoleEnum
+from app.models import Comment, Project, ProjectMember, Task, User
+from app.schemas import PageParams, TaskListResponse
+from app.services.pagination import apply_keyset, encode_cursor
+
+# Must match the configuration of the generated search_vector columns.
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=5"
+
+
+def visible_project_ids(user: User) -> Select:
+    return union(
+        select(ProjectMember.project_id).where(ProjectMember.user_id == user.id),
+        select(Project.id).where(Project.owner_id == user.id),
+    )
+
+
+async def search_tasks(
+    db: AsyncSession, user: User, q: str, project_key: str | None, page: PageParams
+) -> dict:
+    """Rank the tasks whose text or comments match q, best first.
+
+    A task ranks by its own text or its best matching comment, whichever
+    scores higher, and the snippet is taken from that text. Non-admins
+    only see tasks of projects they own or belong to.
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+    # Both lookups are served by the GIN indexes.
+    matches = union(
+        select(Task.id).where(Task.search_vector.op("@@")(query)),
+        select(Comment.task_id).where(Comment.search_vector.op("@@")(query)),
+    )
+
+    best_comment = (
+        select(
+            Comment.content,
+            func.ts_rank(Comment.search_vector, query).label("rank"),
+        )
+        .where(Comment.task_id == Task.id, Comment.search_vector.op("@@")(query))
+        .order_by(func.ts_rank(Comment.search_vector, query).desc())
+        .limit(1)
+        .lateral()
+    )
+
+    task_rank = func.ts_rank(Task.search_vector, query)
+    # Typed, so that cursors can check the rank they carry.
+    rank = func.greatest(
+        task_rank, func.coalesce(best_comment.c.rank, 0), type_=Float
+    ).label("rank")
+    snippet = case(
+        (
+            task_rank >= func.coalesce(best_comment.c.rank, 0),
+            func.ts_headline(
+                SEARCH_CONFIG,
+                func.concat_ws(" ", Task.summary, Task.description),
+                query,
+                HEADLINE_OPTIONS,
+            ),
+        ),
+        else_=func.ts_headline(
+            SEARCH_CONFIG, best_comment.c.content, query, HEADLINE_OPTIONS
+        ),
+    ).label("snippet")
+
+    stmt = (
+        select(Task, rank, snippet)
+        .outerjoin(best_comment, true())
+        .where(Task.id.in_(matches))
+        .options(*TaskListResponse.load_options)
+    )
+
+    if user.role != RoleEnum.admin:
+        stmt = stmt.where(Task.project_id.in_(visible_project_ids(user)))
+
+    if project_key is not None:
+        stmt = stmt.where(
+            Task.project_id
+            == select(Project.id).where(Project.key == project_key).scalar_subquery()
+        )
+
+    rows = (
+        await db.execute(apply_keyset(stmt, page, rank, Task.id, descending=True))
+    ).all()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = encode_cursor([rows[-1].rank, rows[-1].Task.id])
+
+    return {
+        "items": [
+            {"task": row.Task, "rank": row.rank, "snippet": row.snippet} for row in rows
+        ],
+        "next_cursor": next_cursor,
+    }
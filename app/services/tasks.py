@@ -1,11 +1,215 @@
-from sqlalchemy.orm import Session
+from collections import Counter
 
-from app.models import Project
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models import Project, Status, Task, User
+from app.schemas import TaskBulkUpdateItem, TaskCreateRequest
+from app.services.analytics import record_status_changes
+from app.services.bulk import bulk_error
 
-def generate_task_key(db: Session, project: Project) -> str:
-    tasks_count = project.tasks.count()
 
-    generated_name = project.key + "-" + str(tasks_count + 1)
+async def generate_task_key(db: AsyncSession, project: Project) -> str:
+    # The row lock taken by the UPDATE serialises concurrent creates per project.
+    # The counter is not part of any response, so updated_at, which the ETags
+    # are built from, stays as it was.
+    task_number = await db.scalar(
+        update(Project)
+        .where(Project.id == project.id)
+        .values(task_counter=Project.task_counter + 1, updated_at=Project.updated_at)
+        .returning(Project.task_counter)
+    )
+
+    generated_name = project.key + "-" + str(task_number)
 
     return generated_name
+
+
+async def reserve_task_keys(
+    db: AsyncSession, counts: dict[int, int]
+) -> dict[int, list[str]]:
+    # One UPDATE advances every project's counter by its batch size.
+    rows = await db.execute(
+        update(Project)
+        .where(Project.id.in_(counts))
+        .values(
+            task_counter=Project.task_counter + case(counts, value=Project.id),
+            updated_at=Project.updated_at,
+        )
+        .returning(Project.id, Project.key, Project.task_counter)
+        .execution_options(synchronize_session=False)
+    )
+
+    return {
+        project_id: [
+            f"{key}-{number}"
+            for number in range(counter - counts[project_id] + 1, counter + 1)
+        ]
+        for project_id, key, counter in rows
+    }
+
+
+async def existing_ids(db: AsyncSession, column, ids: set[int]) -> set[int]:
+    if not ids:
+        return set()
+
+    return set(await db.scalars(select(column).where(column.in_(ids))))
+
+
+async def bulk_create_tasks(
+    db: AsyncSession, items: list[tuple[int, TaskCreateRequest]], reporter_id: int
+) -> tuple[list[dict], list[dict]]:
+    errors = []
+
+    # Lock the projects in id order so concurrent batches cannot deadlock.
+    project_ids = set(
+        await db.scalars(
+            select(Project.id)
+            .where(Project.id.in_({item.project_id for _, item in items}))
+            .order_by(Project.id)
+            .with_for_update()
+        )
+    )
+    status_ids = await existing_ids(db, Status.id, {i.status_id for _, i in items})
+    user_ids = await existing_ids(db, User.id, {i.assignee_id for _, i in items})
+
+    valid = []
+
+    for index, item in items:
+        if item.project_id not in project_ids:
+            errors.append(bulk_error(index, "Project not found"))
+        elif item.status_id not in status_ids:
+            errors.append(bulk_error(index, "Status not found"))
+        elif item.assignee_id not in user_ids:
+            errors.append(bulk_error(index, "Assignee not found"))
+        else:
+            valid.append((index, item))
+
+    if not valid:
+        return [], errors
+
+    keys = await reserve_task_keys(db, Counter(item.project_id for _, item in valid))
+    keys = {project_id: iter(project_keys) for project_id, project_keys in keys.items()}
+
+    rows = [
+        {
+            "project_id": item.project_id,
+            "summary": item.summary,
+            "description": item.description,
+            "key": next(keys[item.project_id]),
+            "status_id": item.status_id,
+            "priority": item.priority,
+            "reporter_id": reporter_id,
+            "assignee_id": item.assignee_id,
+            "due_date": item.due_date,
+        }
+        for _, item in valid
+    ]
+
+    result = await db.execute(
+        insert(Task).returning(Task.id, Task.key, sort_by_parameter_order=True), rows
+    )
+    await record_status_changes(
+        db, [(item.project_id, None, item.status_id, None) for _, item in valid]
+    )
+
+    created = [
+        {"index": index, "id": task_id, "key": key}
+        for (index, _), (task_id, key) in zip(valid, result, strict=True)
+    ]
+
+    return created, errors
+
+
+async def bulk_update_tasks(
+    db: AsyncSession, items: list[tuple[int, TaskBulkUpdateItem]], user_id: int
+) -> tuple[list[int], list[dict], list[tuple[int, str]]]:
+    """Apply the valid items and book their status changes.
+
+    Returns the ids of the updated tasks, an error entry for every item
+    that was rejected, and the (id, key) of every task that ends up with a
+    different assignee than it had.
+    """
+    errors = []
+
+    # Locked in id order until commit, so that the statuses read here are the
+    # ones the update replaces, and overlapping batches cannot deadlock.
+    tasks = {
+        task.id: task
+        for task in await db.execute(
+            select(
+                Task.id,
+                Task.key,
+                Task.reporter_id,
+                Task.assignee_id,
+                Task.project_id,
+                Task.status_id,
+                Task.created_at,
+            )
+            .where(Task.id.in_({item.id for _, item in items}))
+            .order_by(Task.id)
+            .with_for_update()
+        )
+    }
+    status_ids = await existing_ids(
+        db, Status.id, {i.status_id for _, i in items if i.status_id is not None}
+    )
+    user_ids = await existing_ids(
+        db, User.id, {i.assignee_id for _, i in items if i.assignee_id is not None}
+    )
+
+    rows = []
+    reassigned = []
+
+    for index, item in items:
+        values = item.model_dump(exclude_none=True)
+
+        if item.id not in tasks:
+            errors.append(bulk_error(index, "Task not found"))
+        elif tasks[item.id].reporter_id != user_id:
+            errors.append(
+                bulk_error(index, "You don't have permission to update this task")
+            )
+        elif item.status_id is not None and item.status_id not in status_ids:
+            errors.append(bulk_error(index, "Status not found"))
+        elif item.assignee_id is not None and item.assignee_id not in user_ids:
+            errors.append(bulk_error(index, "Assignee not found"))
+        elif len(values) == 1:
+            errors.append(bulk_error(index, "Nothing to update"))
+        else:
+            rows.append(values)
+
+    if rows:
+        # ORM bulk UPDATE by primary key, batched by the set of changed columns.
+        await db.execute(update(Task), rows)
+
+        # A task listed twice moves from wherever the previous row left it.
+        status_ids = {task_id: task.status_id for task_id, task in tasks.items()}
+        changes = []
+
+        for row in rows:
+            if "status_id" in row:
+                task = tasks[row["id"]]
+                changes.append(
+                    (
+                        task.project_id,
+                        status_ids[task.id],
+                        row["status_id"],
+                        task.created_at,
+                    )
+                )
+                status_ids[task.id] = row["status_id"]
+
+        await record_status_changes(db, changes)
+
+        # The last row for a task decides its assignee.
+        assignee_ids = {
+            row["id"]: row["assignee_id"] for row in rows if "assignee_id" in row
+        }
+        reassigned = [
+            (task_id, tasks[task_id].key)
+            for task_id, assignee_id in assignee_ids.items()
+            if assignee_id != tasks[task_id].assignee_id
+        ]
+
+    return [row["id"] for row in rows], errors, reassigned
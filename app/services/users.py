@@ -3,8 +3,25 @@ import shutil
 from uuid import uuid4
 
 from fastapi import HTTPException, UploadFile
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
-from app.settings import ALLOWED_EXTENSIONS, MAX_FILE_SIZE, MEDIA_PATH, MEDIA_URL
+from app.cache import TTLCache
+from app.models import User
+from app.settings import (
+    ADMIN_AUTH_CACHE_SIZE,
+    ADMIN_AUTH_CACHE_TTL,
+    ALLOWED_EXTENSIONS,
+    MAX_FILE_SIZE,
+    MEDIA_PATH,
+    MEDIA_URL,
+    USER_CACHE_SIZE,
+    USER_CACHE_TTL,
+)
+
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+admin_auth_cache = TTLCache(maxsize=ADMIN_AUTH_CACHE_SIZE, ttl=ADMIN_AUTH_CACHE_TTL)
 
 
 async def validate_image(file: UploadFile):
@@ -31,3 +48,32 @@ async def save_avatar_file(file: UploadFile) -> str:
         shutil.copyfileobj(file.file, buffer)
 
     return f"{MEDIA_URL}/{filename}"
+
+
+def cache_user(user: User) -> None:
+    user_cache.set(
+        user.email,
+        {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs},
+    )
+
+
+async def get_cached_user(db: AsyncSession, email: str) -> User | None:
+    data = user_cache.get(email)
+
+    if data is None:
+        return None
+
+    user = User(**data)
+    make_transient_to_detached(user)
+
+    return await db.merge(user, load=False)
+
+
+def invalidate_cached_user(*emails: str) -> None:
+    for email in emails:
+        user_cache.pop(email)
+
+    # Admin entries are keyed by token, and user changes are rare enough
+    # to simply drop them all.
+    if emails:
+        admin_auth_cache.clear()
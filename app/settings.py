@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -6,6 +7,7 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=Path(__name__).resolve().parent / ".env")
 
 DB_URL = os.getenv("DB_URL")
+ASYNC_DB_URL = os.getenv("ASYNC_DB_URL")
 
 DB_USER = os.getenv('DB_USER', 'postgres')
 DB_PASSWORD = os.getenv('DB_PASSWORD', 'just_fcn_pswd')
@@ -14,6 +16,13 @@ DB_PORT = os.getenv('DB_PORT', '5432')
 DB_DATABASE = os.getenv('DB_DATABASE', 'postgres')
 # DB_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_DATABASE}"
 
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
@@ -30,5 +39,57 @@ STATIC_URL = "/static"
 STATIC_PATH = Path(STATIC_DIR)
 STATIC_PATH.mkdir(exist_ok=True, parents=True)
 
+# Changing these rehashes each password transparently on its next login.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+PASSWORD_HASHER_WORKERS = int(os.getenv("PASSWORD_HASHER_WORKERS", "4"))
+PASSWORD_HASHER_MAX_QUEUE = int(os.getenv("PASSWORD_HASHER_MAX_QUEUE", "256"))
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))  # seconds
+ADMIN_AUTH_CACHE_SIZE = int(os.getenv("ADMIN_AUTH_CACHE_SIZE", "1000"))
+ADMIN_AUTH_CACHE_TTL = int(os.getenv("ADMIN_AUTH_CACHE_TTL", "30"))  # seconds
+
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))  # seconds
+
+# Partition maintenance for audit_logs and notifications; 0 keeps data forever.
+AUDIT_LOG_RETENTION_DAYS = int(os.getenv("AUDIT_LOG_RETENTION_DAYS", "365"))
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+PARTITION_DETACH_EXPIRED = os.getenv("PARTITION_DETACH_EXPIRED", "false").lower() == "true"
+# Users or projects per transaction when counters and rollups are corrected.
+MAINTENANCE_BATCH_SIZE = int(os.getenv("MAINTENANCE_BATCH_SIZE", "1000"))
+
+# "local" serves a single worker; "postgres" relays through LISTEN/NOTIFY.
+NOTIFICATION_BROKER_BACKEND = os.getenv("NOTIFICATION_BROKER_BACKEND", "local")
+NOTIFICATION_STREAM_QUEUE_SIZE = int(os.getenv("NOTIFICATION_STREAM_QUEUE_SIZE", "100"))
+NOTIFICATION_HEARTBEAT_INTERVAL = float(os.getenv("NOTIFICATION_HEARTBEAT_INTERVAL", "15"))  # seconds
+# Open streams hold up a graceful shutdown for at most this long.
+NOTIFICATION_STREAM_MAX_AGE = float(os.getenv("NOTIFICATION_STREAM_MAX_AGE", "300"))  # seconds
+
+# Cached read responses; "postgres" relays invalidations between workers.
+# Admin panel edits are not invalidated and show up once the TTL runs out.
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "local")
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "5000"))  # 0 disables it
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))  # seconds
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "730"))
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# The admin's csv/excel/pdf/print buttons export what the list API returned.
+ADMIN_MAX_LIST_ROWS = int(os.getenv("ADMIN_MAX_LIST_ROWS", "1000"))
+ADMIN_BACKGROUND_EXPORT_ROWS = int(os.getenv("ADMIN_BACKGROUND_EXPORT_ROWS", "200000"))
+ADMIN_COUNT_CACHE_TTL = int(os.getenv("ADMIN_COUNT_CACHE_TTL", "300"))  # seconds
+ADMIN_EXPORT_DIR = Path(os.getenv("ADMIN_EXPORT_DIR", tempfile.gettempdir())) / "mmanage-exports"
+ADMIN_EXPORT_TTL = int(os.getenv("ADMIN_EXPORT_TTL", "3600"))  # seconds
+
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
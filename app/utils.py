@@ -1,19 +1,71 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 
+from fastapi import HTTPException
 from jose import jwt
 from passlib.context import CryptContext
 
-from app.settings import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
+from app.settings import (
+	ACCESS_TOKEN_EXPIRE_MINUTES,
+	ALGORITHM,
+	ARGON2_MEMORY_COST,
+	ARGON2_PARALLELISM,
+	ARGON2_TIME_COST,
+	PASSWORD_HASHER_MAX_QUEUE,
+	PASSWORD_HASHER_WORKERS,
+	SECRET_KEY,
+)
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+	schemes=["argon2"],
+	deprecated="auto",
+	argon2__rounds=ARGON2_TIME_COST,
+	argon2__memory_cost=ARGON2_MEMORY_COST,
+	argon2__parallelism=ARGON2_PARALLELISM,
+)
 
+# argon2 releases the GIL, so a thread pool gives real parallelism.
+password_hasher_executor = ThreadPoolExecutor(
+	max_workers=PASSWORD_HASHER_WORKERS, thread_name_prefix="password-hasher"
+)
+password_hasher_slots = asyncio.Semaphore(PASSWORD_HASHER_WORKERS)
+password_hasher_stats = {"queued": 0, "running": 0, "completed": 0, "rejected": 0}
 
-def hash_password(password: str):
-	return pwd_context.hash(password)
 
+async def run_password_hasher(func, *args):
+	if password_hasher_stats["queued"] >= PASSWORD_HASHER_MAX_QUEUE:
+		password_hasher_stats["rejected"] += 1
+		raise HTTPException(status_code=503, detail="Server is busy, try again later")
 
-def verify_password(plain_password, hashed_password):
-	return pwd_context.verify(plain_password, hashed_password)
+	password_hasher_stats["queued"] += 1
+	try:
+		await password_hasher_slots.acquire()
+	finally:
+		password_hasher_stats["queued"] -= 1
+
+	password_hasher_stats["running"] += 1
+	try:
+		loop = asyncio.get_running_loop()
+		return await loop.run_in_executor(password_hasher_executor, func, *args)
+	finally:
+		password_hasher_stats["running"] -= 1
+		password_hasher_stats["completed"] += 1
+		password_hasher_slots.release()
+
+
+async def hash_password(password: str):
+	return await run_password_hasher(pwd_context.hash, password)
+
+
+async def verify_password(plain_password, hashed_password):
+	return await run_password_hasher(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password(plain_password, hashed_password):
+	return await run_password_hasher(
+		pwd_context.verify_and_update, plain_password, hashed_password
+	)
 
 
 def create_jwt_token(data: dict, expires_delta: float | None = None):
@@ -0,0 +1,104 @@
+"""Compare the list response serialization paths.
+
+Renders one page of tasks three ways and prints the time per page:
+
+- fastapi: ORM objects through FastAPI's response_model validation and
+  the stdlib JSONResponse, which is what list endpoints used to do;
+- orjson: the same, rendered by FastJSONResponse, as every endpoint now
+  is through the app's default_response_class;
+- rows: row tuples through the schema's compiled row builder, as the
+  paginate_rows endpoints do.
+
+Only serialization is timed; the rows path also saves building ORM
+objects from the query result. Run with the app's environment:
+
+    python -m benchmarks.serialization [page size]
+"""
+
+import asyncio
+import json
+import sys
+from time import perf_counter
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models import Project, Status, Task
+from app.responses import FastJSONResponse, dump_rows
+from app.schemas import CursorPage, TaskListResponse
+
+CURSOR = "WzIwMF0"
+
+
+def make_page(size: int) -> tuple[dict, list[tuple]]:
+    project = Project(id=1, key="PRO", name="Project")
+    status = Status(id=1, name="IN_PROGRESS")
+    tasks = [
+        Task(
+            id=i,
+            key=f"PRO-{i}",
+            summary=f"Task summary number {i}",
+            priority="high",
+            project=project,
+            status=status,
+        )
+        for i in range(1, size + 1)
+    ]
+    rows = [
+        (task.id, project.key, task.key, task.summary, status.name, task.priority)
+        for task in tasks
+    ]
+
+    return {"items": tasks, "next_cursor": CURSOR}, rows
+
+
+async def time_per_call(render, number: int) -> tuple[float, bytes]:
+    started = perf_counter()
+
+    for _ in range(number):
+        body = await render()
+
+    return (perf_counter() - started) / number, body
+
+
+async def main(size: int):
+    page, rows = make_page(size)
+    field = create_model_field("Response", CursorPage[TaskListResponse])
+
+    async def fastapi_path() -> bytes:
+        content = await serialize_response(field=field, response_content=page)
+        return JSONResponse(content).body
+
+    async def orjson_path() -> bytes:
+        content = await serialize_response(field=field, response_content=page)
+        return FastJSONResponse(content).body
+
+    async def rows_path() -> bytes:
+        content = {"items": dump_rows(TaskListResponse, rows), "next_cursor": CURSOR}
+        return FastJSONResponse(content).body
+
+    number = max(1, 20000 // size)
+    timings = {}
+    expected = None
+
+    for name, render in (
+        ("fastapi", fastapi_path),
+        ("orjson", orjson_path),
+        ("rows", rows_path),
+    ):
+        timings[name], body = await time_per_call(render, number)
+
+        # Every path must produce the same document.
+        if expected is None:
+            expected = json.loads(body)
+        assert json.loads(body) == expected, name
+
+    print(f"page of {size} tasks, {number} runs each")
+    for name, seconds in timings.items():
+        speedup = timings["fastapi"] / seconds
+        print(f"{name:>8}: {seconds * 1000:8.3f} ms/page  {speedup:5.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,110 @@
+"""Compare request throughput of blocking and async database access.
+
+Serves the same query under concurrent load from two async routes and
+prints the requests per second of each:
+
+- sync: a psycopg2 Session from a blocking engine, as routes used before
+  the async engine; every query holds up the whole event loop;
+- async: an AsyncSession from the app's engine, as db_dep provides now;
+  the loop serves other requests while a query runs.
+
+Each request runs one query that takes delay seconds on the server, which
+stands in for a slow query. Both engines use the app's pool settings. Run
+with the app's environment:
+
+    python -m benchmarks.throughput [requests] [concurrency] [delay]
+"""
+
+import asyncio
+import sys
+from time import perf_counter
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DB_URL, SessionLocal, engine
+from app.settings import DB_MAX_OVERFLOW, DB_POOL_SIZE
+
+QUERY = text("SELECT pg_sleep(:delay)")
+
+
+def make_app(delay: float) -> tuple[FastAPI, Engine]:
+    sync_engine = create_engine(
+        DB_URL, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW
+    )
+    sync_session = sessionmaker(bind=sync_engine)
+    app = FastAPI()
+
+    @app.get("/sync/")
+    async def sync_route():
+        with sync_session() as db:
+            db.execute(QUERY, {"delay": delay})
+
+        return {}
+
+    @app.get("/async/")
+    async def async_route():
+        async with SessionLocal() as db:
+            await db.execute(QUERY, {"delay": delay})
+
+        return {}
+
+    return app, sync_engine
+
+
+async def requests_per_second(
+    client: httpx.AsyncClient, path: str, number: int, concurrency: int
+) -> float:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def request():
+        async with limit:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    # One request first so that both pools start with a connection.
+    await request()
+
+    started = perf_counter()
+    await asyncio.gather(*(request() for _ in range(number)))
+
+    return number / (perf_counter() - started)
+
+
+async def main(number: int, concurrency: int, delay: float):
+    app, sync_engine = make_app(delay)
+    transport = httpx.ASGITransport(app=app)
+    timings = {}
+
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for name in ("sync", "async"):
+                timings[name] = await requests_per_second(
+                    client, f"/{name}/", number, concurrency
+                )
+    finally:
+        sync_engine.dispose()
+        await engine.dispose()
+
+    print(
+        f"{number} requests, {concurrency} concurrent, "
+        f"{delay * 1000:g} ms per query, pool of {DB_POOL_SIZE}"
+    )
+    for name, rate in timings.items():
+        speedup = rate / timings["sync"]
+        print(f"{name:>8}: {rate:8.1f} requests/s  {speedup:5.1f}x")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(
+        main(
+            int(args[0]) if len(args) > 0 else 500,
+            int(args[1]) if len(args) > 1 else 50,
+            float(args[2]) if len(args) > 2 else 0.01,
+        )
+    )
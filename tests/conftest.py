@@ -0,0 +1,108 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import event, select
+
+# The suite drops and recreates every table, so it only runs against a
+# database named for it, e.g.
+#
+#     TEST_DB_URL=postgresql+psycopg2://postgres@localhost/mmanage_test pytest
+TEST_DB_URL = os.getenv("TEST_DB_URL")
+
+os.environ["DB_URL"] = TEST_DB_URL or "postgresql+psycopg2://localhost/mmanage_test"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+# Cached responses would answer without the queries the tests count.
+os.environ["RESPONSE_CACHE_SIZE"] = "0"
+os.environ["ADMIN_EXPORT_DIR"] = tempfile.mkdtemp()
+
+PASSWORD = "password"
+STATUSES = ("TODO", "IN_PROGRESS", "READY_FOR_TEST", "DONE")
+
+
+async def reset_database():
+    from app.database import Base, SessionLocal, engine
+    from app.maintenance import maintain_partitions
+    from app.models import Status
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    await maintain_partitions()
+
+    async with SessionLocal() as db:
+        db.add_all(Status(name=name) for name in STATUSES)
+        await db.commit()
+
+
+@pytest.fixture(scope="session")
+def client():
+    if not TEST_DB_URL:
+        pytest.skip("TEST_DB_URL is not set")
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    # One client, and so one event loop, for the whole session: the engine's
+    # connections belong to the loop that opened them.
+    with TestClient(app) as client:
+        client.portal.call(reset_database)
+        yield client
+
+
+def register(client, email: str) -> dict:
+    # The first user registered is the admin.
+    response = client.post(
+        "/auth/register/", json={"email": email, "password": PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+
+    response = client.post(
+        "/auth/login/", data={"username": email, "password": PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def post(client, url: str, headers: dict, **kwargs) -> dict:
+    response = client.post(url, headers=headers, **kwargs)
+    assert response.status_code == 200, response.text
+
+    return response.json()
+
+
+async def user_id(email: str) -> int:
+    from app.database import SessionLocal
+    from app.models import User
+
+    async with SessionLocal() as db:
+        return await db.scalar(select(User.id).where(User.email == email))
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client) -> dict:
+    return register(client, "admin@example.com")
+
+
+@pytest.fixture(scope="session")
+def member_headers(client, admin_headers) -> dict:
+    return register(client, "member@example.com")
+
+
+@pytest.fixture
+def queries(client):
+    """The SQL statements run while the test does, in order."""
+    from app.database import engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
@@ -0,0 +1,60 @@
+import asyncio
+
+import httpx
+from sqlalchemy import text
+
+REQUESTS = 3000
+CONCURRENCY = 50
+
+
+def admin_cookie(i: int) -> dict:
+    from app.utils import create_jwt_token
+
+    # Distinct tokens miss the identity cache, so each one reads the user.
+    token = create_jwt_token({"sub": "admin@example.com", "request": i}, 60)
+
+    return {"cookie": f"access_token={token}"}
+
+
+async def open_connections() -> int:
+    from app.database import SessionLocal
+
+    async with SessionLocal() as db:
+        return await db.scalar(
+            text(
+                "SELECT count(*) FROM pg_stat_activity"
+                " WHERE datname = current_database()"
+            )
+        )
+
+
+async def admin_requests(app, number: int) -> dict:
+    from app.database import get_pool_stats
+
+    limit = asyncio.Semaphore(CONCURRENCY)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def request(i: int):
+            # Every other request reuses a token, and so the cached identity.
+            async with limit:
+                response = await client.get("/admin/", headers=admin_cookie(i // 2))
+            assert response.status_code == 200, response.text
+
+        await asyncio.gather(*(request(i) for i in range(number)))
+
+    return {**get_pool_stats(), "connections": await open_connections()}
+
+
+def test_admin_requests_do_not_leak_connections(client, admin_headers):
+    # A first burst grows the pool to what the load needs.
+    before = client.portal.call(admin_requests, client.app, CONCURRENCY)
+    after = client.portal.call(admin_requests, client.app, REQUESTS)
+
+    assert after["checkouts"] - before["checkouts"] >= REQUESTS // 2
+    assert after["checked_out"] == 0
+    assert after["overflow"] == 0
+    assert after["checkout_timeouts"] == before["checkout_timeouts"]
+    assert after["idle"] == before["idle"]
+    assert after["connections"] == before["connections"]
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import os
+import time
+
+from sqlalchemy import func, select
+
+from tests.conftest import post, user_id
+
+
+async def task_count() -> int:
+    from app.database import SessionLocal
+    from app.models import Task
+
+    async with SessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(Task))
+
+
+def admin_cookie() -> dict:
+    from app.utils import create_jwt_token
+
+    token = create_jwt_token({"sub": "admin@example.com"}, 60)
+
+    return {"cookie": f"access_token={token}"}
+
+
+def test_background_export_state_lives_in_the_export_dir(client, admin_headers):
+    from app.settings import ADMIN_EXPORT_DIR
+
+    admin_id = client.portal.call(user_id, "admin@example.com")
+    project = post(
+        client,
+        "/projects/create/",
+        admin_headers,
+        json={"name": "Exported", "description": None},
+    )
+    task = post(
+        client,
+        "/tasks/create/",
+        admin_headers,
+        json={
+            "project_id": project["id"],
+            "summary": "Export me",
+            "description": "A quoted field\nthat spans lines",
+            "status_id": 1,
+            "priority": "low",
+            "assignee_id": admin_id,
+            "reporter_id": admin_id,
+            "due_date": None,
+        },
+    )
+    headers = admin_cookie()
+
+    response = client.get("/admin/exports/task/?background=1", headers=headers)
+    assert response.status_code == 202, response.text
+    job_id = response.json()["job_id"]
+
+    # Another worker knows the job only through its file.
+    job_file = ADMIN_EXPORT_DIR / f"{job_id}.json"
+
+    for _ in range(100):
+        job = json.loads(job_file.read_text())
+        if job["status"] != "running":
+            break
+        # Lets the export run on the client's event loop.
+        client.portal.call(asyncio.sleep, 0.05)
+
+    assert job["status"] == "done"
+    # Rows, not lines: the header and the newline in the description don't count.
+    assert job["rows"] == client.portal.call(task_count)
+
+    response = client.get(f"/admin/exports/jobs/{job_id}/", headers=headers)
+    assert response.status_code == 200, response.text
+    assert task["key"] in response.text
+
+    # Served once, then gone for every worker.
+    response = client.get(f"/admin/exports/jobs/{job_id}/", headers=headers)
+    assert response.status_code == 404
+    assert list(ADMIN_EXPORT_DIR.glob(f"*{job_id}*")) == []
+
+    response = client.get("/admin/exports/jobs/..%2Fsecrets/", headers=headers)
+    assert response.status_code == 404
+
+
+def test_stale_export_files_are_pruned(client):
+    from app.admin.exports import prune_export_files
+    from app.settings import ADMIN_EXPORT_DIR
+
+    ADMIN_EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    stale = ADMIN_EXPORT_DIR / "task-stale.csv"
+    fresh = ADMIN_EXPORT_DIR / "task-fresh.csv"
+    stale.write_text("id\n")
+    fresh.write_text("id\n")
+    an_hour_ago = time.time() - 3600
+    os.utime(stale, (an_hour_ago, an_hour_ago))
+
+    prune_export_files(ttl=60)
+
+    assert not stale.exists()
+    assert fresh.exists()
@@ -0,0 +1,70 @@
+from sqlalchemy import select
+
+from tests.conftest import post, user_id
+
+
+async def notified(task_ids: list[int]) -> list[tuple[int, int, str]]:
+    from app.database import SessionLocal
+    from app.models import Notification
+
+    async with SessionLocal() as db:
+        rows = await db.execute(
+            select(
+                Notification.task_id, Notification.recipient_id, Notification.message
+            )
+            .where(Notification.task_id.in_(task_ids))
+            .order_by(Notification.id)
+        )
+
+        return [tuple(row) for row in rows]
+
+
+def test_bulk_writes_notify_assignees(client, admin_headers, member_headers):
+    admin_id = client.portal.call(user_id, "admin@example.com")
+    member_id = client.portal.call(user_id, "member@example.com")
+    project = post(
+        client,
+        "/projects/create/",
+        admin_headers,
+        json={"name": "Bulk Notify", "description": None},
+    )
+
+    def item(assignee_id: int) -> dict:
+        return {
+            "project_id": project["id"],
+            "summary": "Bulk notify",
+            "description": None,
+            "status_id": 1,
+            "priority": "low",
+            "assignee_id": assignee_id,
+            "reporter_id": admin_id,
+            "due_date": None,
+        }
+
+    created = post(
+        client,
+        "/tasks/bulk/",
+        admin_headers,
+        json=[item(member_id), item(admin_id), item(admin_id)],
+    )["created"]
+    first, second, third = ((task["id"], task["key"]) for task in created)
+
+    # The sender is never notified, so only the member's task is.
+    assert client.portal.call(notified, [first[0], second[0], third[0]]) == [
+        (first[0], member_id, f"You were assigned to {first[1]}"),
+    ]
+
+    response = client.patch(
+        "/tasks/bulk/",
+        headers=admin_headers,
+        json=[
+            {"id": second[0], "assignee_id": member_id},
+            {"id": third[0], "assignee_id": admin_id, "priority": "high"},
+        ],
+    )
+    assert response.status_code == 200, response.text
+
+    # The third task kept its assignee.
+    assert client.portal.call(notified, [second[0], third[0]]) == [
+        (second[0], member_id, f"You were assigned to {second[1]}"),
+    ]
@@ -0,0 +1,41 @@
+from tests.conftest import post, user_id
+
+
+def create_task(client, headers: dict, project_id: int, user: int) -> dict:
+    return post(
+        client,
+        "/tasks/create/",
+        headers,
+        json={
+            "project_id": project_id,
+            "summary": "Keep the ETag",
+            "description": None,
+            "status_id": 1,
+            "priority": "low",
+            "assignee_id": user,
+            "reporter_id": user,
+            "due_date": None,
+        },
+    )
+
+
+def test_task_etag_survives_unrendered_writes(client, admin_headers, member_headers):
+    member_id = client.portal.call(user_id, "member@example.com")
+    project = post(
+        client,
+        "/projects/create/",
+        admin_headers,
+        json={"name": "ETag Churn", "description": None},
+    )
+    task = create_task(client, admin_headers, project["id"], member_id)
+
+    etag = client.get(f"/tasks/{task['key']}/", headers=admin_headers).headers["etag"]
+
+    # Advances the project's task counter and the member's unread counter,
+    # neither of which the task's response shows.
+    create_task(client, admin_headers, project["id"], member_id)
+    response = client.get(
+        f"/tasks/{task['key']}/", headers={**admin_headers, "If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
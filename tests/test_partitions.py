@@ -0,0 +1,69 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+
+from tests.conftest import user_id
+
+FAR_AHEAD = 24  # months
+
+
+async def log_and_maintain(user: int, moment: datetime) -> tuple[str, str]:
+    from app.database import SessionLocal
+    from app.maintenance import maintain_partitions
+    from app.models import AuditLog
+
+    async def partition() -> str:
+        async with SessionLocal() as db:
+            return await db.scalar(
+                text(
+                    "SELECT tableoid::regclass::text FROM audit_logs "
+                    "WHERE timestamp = :moment"
+                ),
+                {"moment": moment},
+            )
+
+    async with SessionLocal() as db:
+        db.add(AuditLog(user_id=user, action="From the future", timestamp=moment))
+        await db.commit()
+
+    before = await partition()
+    await maintain_partitions(months_ahead=FAR_AHEAD)
+
+    return before, await partition()
+
+
+def test_default_partition_hands_rows_to_their_month(client, admin_headers):
+    from app.maintenance import add_months
+
+    moment = add_months(datetime.now(UTC), FAR_AHEAD).replace(day=15)
+
+    before, after = client.portal.call(
+        log_and_maintain, client.portal.call(user_id, "admin@example.com"), moment
+    )
+
+    assert before == "audit_logs_default"
+    assert after == f"audit_logs_p{moment:%Y_%m}"
+
+
+async def drift_and_recount() -> tuple[int, list[str], list[str]]:
+    from app.database import engine
+    from app.maintenance import in_batches, recount_unread_batch
+
+    async with engine.begin() as conn:
+        users = await conn.scalar(text("SELECT count(*) FROM users"))
+        await conn.execute(
+            text("UPDATE users SET unread_notifications = unread_notifications + 7")
+        )
+
+    return (
+        users,
+        await in_batches(recount_unread_batch, size=2),
+        await in_batches(recount_unread_batch, size=2),
+    )
+
+
+def test_unread_recount_covers_every_batch(client, member_headers):
+    users, recounted, again = client.portal.call(drift_and_recount)
+
+    assert len(recounted) == users
+    assert again == []
@@ -0,0 +1,14 @@
+from tests.conftest import post
+
+
+def test_project_keys_continue_after_the_highest_suffix(client, admin_headers):
+    def create(name: str) -> str:
+        return post(
+            client,
+            "/projects/create/",
+            admin_headers,
+            json={"name": name, "description": None},
+        )["key"]
+
+    assert [create("Zebra") for _ in range(3)] == ["ZEB", "ZEB2", "ZEB3"]
+    assert create("Zebu") == "ZEB4"
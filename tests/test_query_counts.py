@@ -0,0 +1,102 @@
+import pytest
+
+from tests.conftest import post, register, user_id
+
+PAGE_SIZE = 5
+SEARCH_TERM = "quasar"
+
+
+@pytest.fixture(scope="module")
+def seeded(client, admin_headers, member_headers) -> dict:
+    """More than a page of everything each list endpoint shows."""
+    admin_id = client.portal.call(user_id, "admin@example.com")
+    member_id = client.portal.call(user_id, "member@example.com")
+    count = PAGE_SIZE + 1
+
+    projects = [
+        post(
+            client,
+            "/projects/create/",
+            admin_headers,
+            json={"name": f"Query Counts {i}", "description": None},
+        )
+        for i in range(count)
+    ]
+    project = projects[0]
+
+    for i in range(count):
+        register(client, f"query-counts-{i}@example.com")
+        post(
+            client,
+            f"/projects/{project['key']}/members/invite/",
+            admin_headers,
+            json={
+                "user_id": client.portal.call(user_id, f"query-counts-{i}@example.com"),
+                "role": "developer",
+            },
+        )
+
+    # Each assignment notifies the member.
+    tasks = [
+        post(
+            client,
+            "/tasks/create/",
+            admin_headers,
+            json={
+                "project_id": project["id"],
+                "summary": f"Chart the {SEARCH_TERM} {i}",
+                "description": None,
+                "status_id": 1,
+                "priority": "high",
+                "assignee_id": member_id,
+                "reporter_id": admin_id,
+                "due_date": None,
+            },
+        )
+        for i in range(count)
+    ]
+
+    for i in range(count):
+        post(
+            client,
+            "/comments/comments/create/",
+            admin_headers,
+            json={"task_id": tasks[0]["id"], "content": f"Comment {i}"},
+        )
+
+    return {"project": project["key"], "task": tasks[0]["key"]}
+
+
+LIST_ENDPOINTS = {
+    "all tasks": ("/tasks/all/", "admin"),
+    "all projects": ("/projects/all/", "admin"),
+    "project tasks": ("/projects/{project}/tasks/", "admin"),
+    "project members": ("/projects/{project}/members/", "admin"),
+    "task comments": ("/tasks/{task}/comments/", "admin"),
+    "notifications": ("/notifications/notifications/", "member"),
+    "search": (f"/tasks/search/?q={SEARCH_TERM}", "admin"),
+}
+
+
+@pytest.mark.parametrize("endpoint", LIST_ENDPOINTS.values(), ids=LIST_ENDPOINTS)
+def test_list_query_count_does_not_grow_with_page_size(
+    client, seeded, queries, admin_headers, member_headers, endpoint
+):
+    path, user = endpoint
+    url = path.format(**seeded)
+    headers = admin_headers if user == "admin" else member_headers
+    separator = "&" if "?" in url else "?"
+
+    def count_queries(limit: int) -> int:
+        queries.clear()
+        response = client.get(f"{url}{separator}limit={limit}", headers=headers)
+        assert response.status_code == 200, response.text
+        assert len(response.json()["items"]) == limit
+
+        # The audit writer flushes on its own schedule, not the request's.
+        return sum("audit_logs" not in statement for statement in queries)
+
+    # The first request also fills the authenticated user cache.
+    count_queries(1)
+
+    assert count_queries(1) == count_queries(PAGE_SIZE)
@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+from sqlalchemy import func, select
+
+from tests.conftest import post, user_id
+
+MOVES = 60
+
+
+async def move_concurrently(app, headers: dict, task_id: int):
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def move(i: int):
+            response = await client.patch(
+                f"/tasks/{task_id}/move/",
+                headers=headers,
+                json={"status_id": i % 3 + 2},
+            )
+            assert response.status_code == 200, response.text
+
+        await asyncio.gather(*(move(i) for i in range(MOVES)))
+
+
+async def rollup_counts(project_id: int) -> tuple[dict, dict]:
+    from app.database import SessionLocal
+    from app.models import ProjectStatusRollup, Task
+
+    async with SessionLocal() as db:
+        booked = await db.execute(
+            select(
+                ProjectStatusRollup.status_id,
+                func.sum(ProjectStatusRollup.entered - ProjectStatusRollup.exited),
+            )
+            .where(ProjectStatusRollup.project_id == project_id)
+            .group_by(ProjectStatusRollup.status_id)
+        )
+        actual = await db.execute(
+            select(Task.status_id, func.count())
+            .where(Task.project_id == project_id)
+            .group_by(Task.status_id)
+        )
+
+        return (
+            {status_id: count for status_id, count in booked if count},
+            dict(actual.all()),
+        )
+
+
+def test_concurrent_moves_keep_rollups_exact(client, admin_headers):
+    admin_id = client.portal.call(user_id, "admin@example.com")
+    project = post(
+        client,
+        "/projects/create/",
+        admin_headers,
+        json={"name": "Rollup Race", "description": None},
+    )
+    task = post(
+        client,
+        "/tasks/create/",
+        admin_headers,
+        json={
+            "project_id": project["id"],
+            "summary": "Moved about",
+            "description": None,
+            "status_id": 1,
+            "priority": "low",
+            "assignee_id": admin_id,
+            "reporter_id": admin_id,
+            "due_date": None,
+        },
+    )
+
+    client.portal.call(move_concurrently, client.app, admin_headers, task["id"])
+    booked, actual = client.portal.call(rollup_counts, project["id"])
+
+    assert booked == actual
@@ -0,0 +1,86 @@
+import asyncio
+
+import httpx
+
+from tests.conftest import post, user_id
+
+SINGLE_CREATES = 1500
+BULK_CREATES = 25
+BULK_SIZE = 20
+CONCURRENCY = 50
+
+
+def task_item(project_id: int, reporter_id: int, summary: str) -> dict:
+    return {
+        "project_id": project_id,
+        "summary": summary,
+        "description": None,
+        "status_id": 1,
+        "priority": "low",
+        "assignee_id": reporter_id,
+        "reporter_id": reporter_id,
+        "due_date": None,
+    }
+
+
+async def create_concurrently(app, headers: dict, project_id: int, reporter_id: int):
+    limit = asyncio.Semaphore(CONCURRENCY)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def create(i: int) -> list[str]:
+            async with limit:
+                response = await client.post(
+                    "/tasks/create/",
+                    headers=headers,
+                    json=task_item(project_id, reporter_id, f"Single {i}"),
+                )
+            assert response.status_code == 200, response.text
+
+            return [response.json()["key"]]
+
+        async def bulk_create(i: int) -> list[str]:
+            async with limit:
+                response = await client.post(
+                    "/tasks/bulk/",
+                    headers=headers,
+                    json=[
+                        task_item(project_id, reporter_id, f"Bulk {i}.{j}")
+                        for j in range(BULK_SIZE)
+                    ],
+                )
+            assert response.status_code == 200, response.text
+            assert response.json()["errors"] == []
+
+            return [item["key"] for item in response.json()["created"]]
+
+        # Interleave both paths, so that single and bulk creates race each
+        # other for the same counter.
+        batches = await asyncio.gather(
+            *(create(i) for i in range(SINGLE_CREATES)),
+            *(bulk_create(i) for i in range(BULK_CREATES)),
+        )
+
+    return [key for batch in batches for key in batch]
+
+
+def test_concurrent_creates_get_unique_gapless_keys(client, admin_headers):
+    admin_id = client.portal.call(user_id, "admin@example.com")
+    project = post(
+        client,
+        "/projects/create/",
+        admin_headers,
+        json={"name": "Key Race", "description": None},
+    )
+
+    keys = client.portal.call(
+        create_concurrently, client.app, admin_headers, project["id"], admin_id
+    )
+
+    total = SINGLE_CREATES + BULK_CREATES * BULK_SIZE
+    assert len(keys) == total
+    assert len(set(keys)) == total
+    assert sorted(keys, key=lambda key: int(key.rsplit("-", 1)[1])) == [
+        f"{project['key']}-{number}" for number in range(1, total + 1)
+    ]